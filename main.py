@@ -2,6 +2,9 @@
 
 
 import argparse
+import sys
+
+from src.backends.base import NullBackend
 from src.game import Game
 
 
@@ -9,13 +12,139 @@ def init_argparse() -> argparse.ArgumentParser:
     _parser = argparse.ArgumentParser(description='Process some integers.')
     _parser.add_argument('--headless', dest='headless', action='store_true',
                          help='Use headless console version.')
+    _parser.add_argument('--hash', dest='hash_size', type=float, default=16,
+                         help='Transposition table size in MB.')
+    _parser.add_argument('--uci', action='store_true',
+                         help='Speak the UCI protocol over stdin and stdout.')
+    _parser.add_argument('--engine', choices=('white', 'black'), default=None,
+                         help='Let the engine play the given color.')
+    _parser.add_argument('--move-time', type=float, default=None,
+                         help='Engine time per move in seconds, 1 second if no clock is given.')
+    _parser.add_argument('--clock', type=float, default=None,
+                         help='Engine clock in seconds, spread over the moves.')
+    _parser.add_argument('--increment', type=float, default=0,
+                         help='Engine clock increment per move in seconds.')
+    _parser.add_argument('--ponder', action='store_true',
+                         help='Let the engine search the expected reply while the opponent thinks.')
+    _parser.add_argument('--analysis', action='store_true',
+                         help='Analyse the current position in a background process and show the result.')
+
+    subparsers = _parser.add_subparsers(dest='command')
+    perft_parser = subparsers.add_parser('perft', help='Count move generator nodes and verify them.')
+    perft_parser.add_argument('--depth', type=int, default=3,
+                              help='Maximum depth in plies.')
+    perft_parser.add_argument('--fen', default=None,
+                              help='Run a single position instead of the reference positions.')
+    perft_parser.add_argument('--divide', action='store_true',
+                              help='Print node counts per root move at maximum depth.')
+    perft_parser.add_argument('--cache', action='store_true',
+                              help='Cache subtree node counts by position.')
+    perft_parser.add_argument('--debug-hash', action='store_true',
+                              help='Verify the incremental position hash after every move.')
+
+    search_parser = subparsers.add_parser('search', help='Search the best move and report every iteration.')
+    search_parser.add_argument('--depth', type=int, default=5,
+                               help='Maximum depth in plies.')
+    search_parser.add_argument('--nodes', type=int, default=None,
+                               help='Maximum number of nodes.')
+    search_parser.add_argument('--time', type=float, default=None,
+                               help='Maximum duration in seconds.')
+    search_parser.add_argument('--fen', default='rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                               help='Position to search.')
+    search_parser.add_argument('--workers', type=int, default=1,
+                               help='Number of worker processes sharing the transposition table (Lazy SMP).')
+    search_parser.add_argument('--stats', action='store_true',
+                               help='Report branching factor and first move cutoff rate per iteration.')
+    search_parser.add_argument('--no-ordering', dest='ordering', action='store_false',
+                               help='Search moves in generation order to measure the move ordering gain.')
+
+    smp_parser = subparsers.add_parser('smp-bench', help='Measure the parallel search speedup per worker count.')
+    smp_parser.add_argument('--depth', type=int, default=5,
+                            help='Depth every run has to reach.')
+    smp_parser.add_argument('--workers', type=int, default=4,
+                            help='Maximum number of worker processes.')
+    smp_parser.add_argument('--fen', default='r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                            help='Position to search.')
     return _parser
 
 
+def run_uci(args: argparse.Namespace) -> bool:
+    from src.engine.uci import UciEngine
+
+    UciEngine(Game(backend=NullBackend, hash_size=args.hash_size)).run()
+    return True
+
+
+def run_smp_benchmark(args: argparse.Namespace) -> bool:
+    from src.engine.parallel import benchmark
+
+    game = Game(backend=NullBackend)
+    game.board.reset(args.fen)
+    benchmark(game.board, args.depth, args.workers, args.hash_size)
+    return True
+
+
+def run_search(args: argparse.Namespace) -> bool:
+    from src.engine import ParallelSearch, Searcher, SearchLimits
+
+    game = Game(backend=NullBackend, hash_size=args.hash_size)
+    game.board.reset(args.fen)
+    limits = SearchLimits(args.depth, args.nodes, args.time)
+    if args.workers > 1:
+        searcher = ParallelSearch(game.board, args.workers, args.hash_size, on_iteration=lambda info: print(f'info {info}'))
+        result = searcher.search(limits)
+        searcher.close()
+    else:
+        searcher = Searcher(game.board, game.transposition_table, on_iteration=lambda info: print(f'info {info}'),
+                            ordering=args.ordering, statistics=args.stats)
+        result = searcher.search(limits)
+    if result is None or result.best_move is None:
+        print('bestmove (none)')
+        return False
+    print(f'bestmove {result.best_move}')
+    return True
+
+
+def run_perft(args: argparse.Namespace) -> bool:
+    from src import perft
+
+    if args.fen is None:
+        return perft.run_suite(args.depth, args.divide, args.cache, args.debug_hash)
+
+    game = Game(backend=NullBackend, hash_size=args.hash_size)
+    game.board.reset(args.fen)
+    return perft.run(game.board, args.depth, show_divide=args.divide, use_cache=args.cache,
+                     debug_hash=args.debug_hash)
+
+
 if __name__ == '__main__':
     parser = init_argparse()
     args = parser.parse_args()
-    game = Game(not args.headless)
+    if args.uci:
+        sys.exit(0 if run_uci(args) else 1)
+    if args.command == 'perft':
+        sys.exit(0 if run_perft(args) else 1)
+    if args.command == 'search':
+        sys.exit(0 if run_search(args) else 1)
+    if args.command == 'smp-bench':
+        sys.exit(0 if run_smp_benchmark(args) else 1)
+
+    engine = None
+    if args.engine:
+        from src.engine.player import EnginePlayer
+        from src.engine.timing import TimeControl
+
+        move_time = args.move_time if args.move_time is not None or args.clock is not None else 1.
+        engine = EnginePlayer(args.engine == 'white', TimeControl(move_time, args.clock, args.increment),
+                              ponder=args.ponder)
+
+    analysis = None
+    if args.analysis:
+        from src.engine.analysis import Analysis
+
+        analysis = Analysis(args.hash_size)
+
+    game = Game(not args.headless, hash_size=args.hash_size, engine=engine, analysis=analysis)
     game.run()
 
     game.reset()
@@ -1,11 +1,13 @@
 from typing import Tuple, Union, List
 import numpy as np
 from base import QEnv
+from src.backends.base import NullBackend
 from src.game import Game
 
 from src.figures import FieldType, Figure
 from src.helpers import Coords
-from src.history import TurnHistory
+from src.history import GameHistory
+from src.move import Move
 
 
 class TurnAction:
@@ -42,8 +44,13 @@ class ChessEnvironment(QEnv):
     ACTION_SPACE_SIZE = (SIZE + SIZE) * MAX_NUM_ACTIONS
     episode_step: int = 0
 
-    def __init__(self):
-        self.game = Game(frame_rate=0)
+    def __init__(self, visualize: bool = False):
+        """
+        :param visualize: show the game in a pygame window, training runs without any backend otherwise
+        """
+        # statistics are kept over all episodes
+        self.game_history = GameHistory()
+        self.game = Game(frame_rate=0, game_history=self.game_history, backend=None if visualize else NullBackend)
         self.state_storage = None
         self.is_white = True
         self.current_start_reward = 0
@@ -52,22 +59,16 @@ class ChessEnvironment(QEnv):
         super().__init__()
 
     def set_figure_map(self):
-        self.figure_map = dict()
-        i = 0
-        for row in self.game.board.fields:
-            for cell in filter(lambda x: x is not None and x.is_white == self.is_white, row):
-                self.figure_map[i] = cell
-                i = i + 1
+        # row-major board order, trained models map their actions to figures in this order
+        pieces = sorted(self.game.board.get_pieces(self.is_white), key=lambda figure: figure.square)
+        self.figure_map = dict(enumerate(pieces))
 
     def reset(self) -> Tuple[Union[float, int], Union[float, int]]:
         """
         Resets the env state to initial (random) values.
         :return:
         """
-        heatmap = self.game.backend.stats_section.heatmap.copy()
-        self.game = Game(frame_rate=0)
-        self.game.history = TurnHistory()
-        self.game.backend.stats_section.heatmap = heatmap
+        self.game.restart()
         self.episode_step = 0
         self.set_figure_map()
 
@@ -93,14 +94,13 @@ class ChessEnvironment(QEnv):
         reward = 0
         self.set_figure_map()
 
-        first_click = self.get_figure_by_index(action)
-        if first_click:
-            first_click = first_click.position
-            offset = action % 64
-            second_click = Coords(offset % 8, int(offset/8))
-            self.game.handle_mouse_click(first_click.col, first_click.row)
-            if self.game.board.selected_figure:
-                self.game.handle_mouse_click(second_click.col, second_click.row)
+        figure = self.get_figure_by_index(action)
+        if figure:
+            if figure.is_white == self.game.is_white_turn:
+                # illegal moves are ignored, pawns reaching the last row become queens
+                end = action % 64
+                is_promotion = FieldType.clear(figure.type) == FieldType.PAWN and end >> 3 in (0, 7)
+                self.game.play(Move(figure.square, end, FieldType.QUEEN if is_promotion else FieldType.EMPTY))
             else:
                 reward -= 100
         else:
@@ -118,8 +118,7 @@ class ChessEnvironment(QEnv):
         #     reward += self.CHECK_PENALTIES[enemy_type]
 
         # reward = 0.0
-        for row in self.game.board.fields:
-            reward = reward + sum([field.value for field in filter(lambda x: x is not None, row)])
+        reward = reward + self.game.board.material()
 
         return self.get_current_state(), reward, not self.game.running
 
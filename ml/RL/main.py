@@ -13,7 +13,8 @@ import os
 import random
 
 from agent import ChessAgent
-from environment import ChessEnvironment, TurnAction
+from environment import ChessEnvironment
+from src.figures import FieldType
 
 MODEL_NAME = "Chess"
 MIN_REWARD = 1200
@@ -29,7 +30,7 @@ MIN_EPSILON = 0.001
 
 #  Stats settings
 AGGREGATE_STATS_EVERY = 5  # episodes
-SHOW_PREVIEW = True
+SHOW_PREVIEW = False
 
 
 """
@@ -81,23 +82,19 @@ def get_random_action(env, is_white):
 
 
 def perform_random_action(env):
-    moves = []
-    for row in env.game.board.fields:
-        for cell in row:
-            if cell and not cell.is_white:
-                allowed_moves = cell.remove_set(cell.allowed_moves)
-                if allowed_moves:
-                    moves.append(TurnAction(figure=cell, allowed_moves=allowed_moves))
-    fig = moves[random.randint(0, len(moves) - 1)]
-    move = fig.allowed_moves[random.randint(0, len(fig.allowed_moves) - 1)]
-    env.game.handle_mouse_click(fig.figure.position.x, fig.figure.position.y)
-    env.game.handle_mouse_click(move.x, move.y)
-    if env.game.backend.needs_render_selector:
-        env.game.board.handle_figure_promotion(0, 0)
+    # random figure first, then one of its moves, promoting to a queen
+    moves = dict()
+    for move in env.game.board.legal_moves():
+        if move.promotion in (FieldType.EMPTY, FieldType.QUEEN):
+            moves.setdefault(move.start, []).append(move)
+    if not moves:
+        return
+    figure_moves = list(moves.values())[random.randint(0, len(moves) - 1)]
+    env.game.play(figure_moves[random.randint(0, len(figure_moves) - 1)])
 
 
 def main():
-    env = ChessEnvironment()
+    env = ChessEnvironment(visualize=SHOW_PREVIEW)
 
     # For stats
     ep_rewards = [0]
@@ -155,7 +152,8 @@ def main():
                 action = np.argmax(qs)
                 was_ml = True
                 env.game.game_history.data['ml_hits'] += 1
-                env.game.backend.stats_section.heatmap[action % 64] += 1
+                if env.game.use_pygame:
+                    env.game.backend.stats_section.heatmap[action % 64] += 1
 
             else:
                 # Get random action
@@ -174,21 +172,19 @@ def main():
 
                 env.game.game_history.data['ml_ratio'] = env.game.game_history.data['ml_success'] / env.game.game_history.data['ml_hits']
 
-            if env.game.backend.needs_render_selector:
-                env.game.board.handle_figure_promotion(0, 0)
-
             # Transform new continuous state to new discrete state and count reward
             episode_reward += 2 if not was_miss and was_ml else 0
 
             if done:
                 break
 
-            # if SHOW_PREVIEW:# and not episode % AGGREGATE_STATS_EVERY:
-            env.render()
+            if SHOW_PREVIEW:
+                env.render()
 
             while not env.game.is_white_turn and env.game.running:
                 perform_random_action(env)
-                env.render()
+                if SHOW_PREVIEW:
+                    env.render()
                 #
                 # if env.game.board.checked_figure:
                 #     enemy_type = FieldType.clear(env.game.board.checked_figure.type)
@@ -210,8 +206,6 @@ def main():
 
         env.game.game_history.data['current_reward'] = episode_reward
 
-        env.game.reset(True)
-
         # Append episode reward to a list and log stats (every given number of episodes)
         ep_rewards.append(episode_reward)
         if not episode % AGGREGATE_STATS_EVERY or episode == 1:
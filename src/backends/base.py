@@ -1,7 +1,6 @@
-from unittest import mock
-
-
 class BaseBackend:
+    # backend draws with pygame, the board needs its textures
+    uses_pygame = False
 
     def __init__(self, game):
         self.game = game
@@ -30,26 +29,45 @@ class BaseBackend:
     def handle_mouse_click(self):
         pass
 
+    def request_promotion(self, is_pending: bool):
+        """
+        Shows the figure selector while a promotion is pending
+        """
+        self.needs_render_selector = is_pending
+
+    def show_result(self, text: str):
+        """
+        Reports the end of the game, batch backends stay silent
+        """
+        pass
+
     def shutdown(self):
         pass
 
 
+class NullBackend(BaseBackend):
+    """
+    Backend without any output or input for batch work like training, data collection and benchmarks.
+
+    Imports nothing graphical, every hook is a no-op and moves are only played through `Game.play`.
+    """
+
+
 class HeadlessBackend(BaseBackend):
     def __init__(self, game):
         super().__init__(game)
+        from unittest import mock
 
         self.canvas = mock.Mock(get_width=mock.Mock(return_value=20*8),
                                 get_height=mock.Mock(return_value=20*8))
 
     def handle_game_events(self, procedures, events=None):
-        next_move = ''
-        while len(next_move) != 4:
-            next_move = input(f'Next move ({"White" if self.game.is_white_turn else "Black"}): ')
-        next_move = list(next_move)
-        start = self.game.history.string_to_pos(next_move[:2])
-        end = self.game.history.string_to_pos(next_move[2:])
-        self.game.handle_mouse_click(start.x, start.y)
-        self.game.handle_mouse_click(end.x, end.y)
+        # moves in long algebraic notation, promotions name the piece, e.g. e7e8q
+        while not self.game.play_uci(input(f'Next move ({"White" if self.game.is_white_turn else "Black"}): ')):
+            pass
 
     def render(self):
         print(self.game.history.last_move)
+
+    def show_result(self, text: str):
+        print(text)
@@ -6,7 +6,8 @@ from src.backends.screen import screen
 import pygame
 
 from src.backends.base import BaseBackend
-from src.backends.sections import StatisticsSection, TurnHistorySection
+from src.backends.colors import WHITE
+from src.backends.sections import AnalysisSection, StatisticsSection, TurnHistorySection
 from src.backends.selector import FigureSelector
 
 
@@ -14,6 +15,8 @@ EventCallback = Callable[[Event], None]
 
 
 class PygameBackend(BaseBackend):
+    uses_pygame = True
+
     def __init__(self, game):
         super().__init__(game)
         self.canvas = pygame.Surface((screen.get_field_width(), screen.get_field_height()))
@@ -22,6 +25,14 @@ class PygameBackend(BaseBackend):
         self.stats_section.resize(screen)
         self.turn_history_section = TurnHistorySection()
         self.turn_history_section.resize(screen)
+        self.analysis_section = AnalysisSection()
+        self.analysis_section.resize(screen)
+        # state of the last frame, see `render`
+        self.needs_full_redraw = True
+        self.is_selector_shown = False
+        self.status_text: Optional[str] = None
+        # outcome of the last finished game, shown in the status line until a new game runs
+        self.result: Optional[str] = None
 
     def handle_game_events(self, procedures: Optional[List[EventCallback]] = None, events=None) -> None:
         def quit_event(event):
@@ -50,21 +61,57 @@ class PygameBackend(BaseBackend):
     def render(self) -> None:
         """
         Renders all required things for the game
+
+        Only changed parts are drawn, in the order board, status, figure selector and sections, a part is
+        drawn again if a part below it was. The window is updated for the drawn areas only and frames
+        without any change are skipped.
         """
-        screen.fill((255, 255, 255))
-        self.game.board.draw()
-        text = f'{"Whites" if self.game.is_white_turn else "Blacks"} turn {self.game.history}'
+        full = self.needs_full_redraw
+        self.needs_full_redraw = False
+        if full:
+            screen.fill(WHITE)
+
+        board = self.game.board
+        if self.needs_render_selector != self.is_selector_shown:
+            # the selector covers part of the board
+            self.is_selector_shown = self.needs_render_selector
+            board.invalidate()
+        dirty = board.draw(full)
 
-        screen.draw_text(text, (50, screen.get_height() - 15))
-        if self.needs_render_selector:
-            self.figure_selector.render(self.game.is_white_turn)
-        self.stats_section.render(screen, game=self.game)
-        self.turn_history_section.render(screen, history=self.game.history)
-        pygame.display.flip()
+        text = f'{"Whites" if self.game.is_white_turn else "Blacks"} turn {self.game.history}'
+        if self.result is not None and not self.game.running:
+            text = self.result
+        if full or text != self.status_text:
+            self.status_text = text
+            rect = pygame.Rect(0, screen.get_height() - 20, screen.get_width(), 20)
+            screen.window.fill(WHITE, rect)
+            screen.draw_text(text, (50, screen.get_height() - 15))
+            dirty.append(rect)
+
+        if self.is_selector_shown:
+            rect = self.figure_selector.white_surf.get_rect()
+            if full or rect.collidelist(dirty) != -1:
+                self.figure_selector.render(board.selected_figure.is_white)
+                dirty.append(rect)
+
+        sections = [(self.stats_section, {'game': self.game}),
+                    (self.turn_history_section, {'history': self.game.history})]
+        if self.game.analysis is not None:
+            sections.append((self.analysis_section, {'game': self.game}))
+        for section, kwargs in sections:
+            rect = section.render(screen, force=full or section.rect(screen).collidelist(dirty) != -1, **kwargs)
+            if rect is not None:
+                dirty.append(rect)
+
+        if full:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
 
     def rescale(self):
         self.canvas = pygame.Surface((screen.get_field_width(), screen.get_field_height()))
         self.figure_selector = FigureSelector()
+        self.needs_full_redraw = True
 
     def reset(self):
         self.rescale()
@@ -95,9 +142,12 @@ class PygameBackend(BaseBackend):
         rows = int(mouse_pos[1] / scale[1])
 
         if self.needs_render_selector:
-            self.game.board.handle_figure_promotion(cols, rows)
+            self.game.board.handle_figure_promotion(cols, rows, self.figure_selector)
         else:
             self.game.handle_mouse_click(cols, rows)
 
+    def show_result(self, text: str):
+        self.result = text
+
     def shutdown(self):
         pygame.quit()
@@ -1,20 +1,86 @@
+import os
+from typing import Dict, Optional, Tuple
+
 import pygame
 
 from src.figures import FieldType
 
 
+RESOURCES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'resources')
+FIGURE_FONT_PATH = os.path.join(RESOURCES_PATH, 'merida.ttf')
+
+# characters of the figures in the merida font
+FIGURE_CHARS = {
+    FieldType.WHITE | FieldType.PAWN: 'p',
+    FieldType.BLACK | FieldType.PAWN: 'o',
+    FieldType.WHITE | FieldType.KNIGHT: 'n',
+    FieldType.BLACK | FieldType.KNIGHT: 'm',
+    FieldType.WHITE | FieldType.BISHOP: 'b',
+    FieldType.BLACK | FieldType.BISHOP: 'v',
+    FieldType.WHITE | FieldType.ROOK: 'r',
+    FieldType.BLACK | FieldType.ROOK: 't',
+    FieldType.WHITE | FieldType.QUEEN: 'q',
+    FieldType.BLACK | FieldType.QUEEN: 'w',
+    FieldType.WHITE | FieldType.KING: 'k',
+    FieldType.BLACK | FieldType.KING: 'l',
+}
+
+
+def init() -> None:
+    """
+    Initializes pygame and its font module once, called before the first window or font is created
+    """
+    if not pygame.get_init():
+        pygame.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
 class Screen:
-    def __init__(self, surf: pygame.Surface):
-        self.window = surf
-        self.font = pygame.font.SysFont('DejaVu Sans Mono', size=16, bold=True)
+    """
+    Game window, opened on first drawing, fonts are loaded on first use and cached per size.
+
+    Until the window is opened its size is the requested one, so surfaces can be laid out beforehand.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.size = width, height
+        self._window: Optional[pygame.Surface] = None
+        self._font: Optional[pygame.font.Font] = None
+        self.figure_fonts: Dict[int, pygame.font.Font] = dict()
+        # pre-rendered figures of the current figure size by figure type
+        self.glyphs: Dict[int, pygame.Surface] = dict()
         self.figure_size = 0
-        self.figure_font = None
-        self.resize_figure_font(0.35 * surf.get_width() / 8)
+        self.resize_figure_font(0.35 * width / 8)
 
     @classmethod
     def build(cls, width, height):
-        size = width, height
-        return cls(pygame.display.set_mode(size, pygame.RESIZABLE | pygame.NOFRAME))
+        return cls(width, height)
+
+    @property
+    def window(self) -> pygame.Surface:
+        if self._window is None:
+            init()
+            self._window = pygame.display.set_mode(self.size, pygame.RESIZABLE | pygame.NOFRAME)
+        return self._window
+
+    @property
+    def font(self) -> pygame.font.Font:
+        if self._font is None:
+            init()
+            self._font = pygame.font.SysFont('DejaVu Sans Mono', size=16, bold=True)
+        return self._font
+
+    @property
+    def figure_font(self) -> pygame.font.Font:
+        return self.get_figure_font(self.figure_size)
+
+    def get_figure_font(self, size: int) -> pygame.font.Font:
+        font = self.figure_fonts.get(size)
+        if font is None:
+            init()
+            font = self.figure_fonts[size] = pygame.font.Font(FIGURE_FONT_PATH, size)
+        return font
 
     def draw_text(self, text, position):
         self.draw_text_to_surface(text, position, self.window)
@@ -22,29 +88,21 @@ class Screen:
     def resize_figure_font(self, size):
         if self.figure_size != int(size):
             self.figure_size = int(size)
-            self.figure_font = pygame.font.Font('/home/phil/work/private/chess/resources/merida.ttf', self.figure_size)
+            self.glyphs = dict()
+
+    def render_glyphs(self) -> None:
+        """
+        Renders every figure once in the current figure size
+        """
+        font = self.figure_font
+        self.glyphs = {fig_type: font.render(char, False, (0, 0, 0)) for fig_type, char in FIGURE_CHARS.items()}
 
     def draw_figure(self, fig_type, position, surface=None):
         if surface is None:
             surface = self.window
-
-        text = {
-            FieldType.WHITE | FieldType.PAWN: 'p',
-            FieldType.BLACK | FieldType.PAWN: 'o',
-            FieldType.WHITE | FieldType.KNIGHT: 'n',
-            FieldType.BLACK | FieldType.KNIGHT: 'm',
-            FieldType.WHITE | FieldType.BISHOP: 'b',
-            FieldType.BLACK | FieldType.BISHOP: 'v',
-            FieldType.WHITE | FieldType.ROOK: 'r',
-            FieldType.BLACK | FieldType.ROOK: 't',
-            FieldType.WHITE | FieldType.QUEEN: 'q',
-            FieldType.BLACK | FieldType.QUEEN: 'w',
-            FieldType.WHITE | FieldType.KING: 'k',
-            FieldType.BLACK | FieldType.KING: 'l',
-        }[fig_type]
-
-        text_surface = self.figure_font.render(text, False, (0, 0, 0))
-        surface.blit(text_surface, position)
+        if not self.glyphs:
+            self.render_glyphs()
+        surface.blit(self.glyphs[fig_type], position)
 
     def draw_text_to_surface(self, text, position, surface, color=(0, 0, 0)):
         text_surface = self.font.render(text, True, color)
@@ -53,25 +111,25 @@ class Screen:
     def fill(self, color):
         self.window.fill(color)
 
-    def blit(self, canvas, rect):
-        self.window.blit(canvas, rect)
+    def blit(self, canvas, rect, area=None) -> pygame.Rect:
+        return self.window.blit(canvas, rect, area)
 
-    def get_size(self):
-        return self.window.get_size()
+    def get_size(self) -> Tuple[int, int]:
+        if self._window is None:
+            return self.size
+        return self._window.get_size()
 
     def get_height(self):
-        return self.window.get_height()
+        return self.get_size()[1]
 
     def get_width(self):
-        return self.window.get_width()
+        return self.get_size()[0]
 
     def get_field_height(self):
-        return self.window.get_height() * 0.8
+        return self.get_height() * 0.8
 
     def get_field_width(self):
-        return self.window.get_width() * 0.7
+        return self.get_width() * 0.7
 
 
-pygame.init()
-pygame.font.init()
 screen = Screen.build(320, 240)
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import pygame
 
@@ -8,9 +8,37 @@ from src.history import TurnHistory, Turn
 
 
 class DisplaySection:
-    def render(self, canvas, **kwargs):
+    """
+    Part of the window drawn from a cached surface, which is only refreshed when its data changed
+    """
+    surface: Optional[pygame.Surface] = None
+
+    def position(self, canvas) -> Tuple[float, float]:
+        raise NotImplementedError()
+
+    def rect(self, canvas) -> pygame.Rect:
+        return self.surface.get_rect(topleft=self.position(canvas))
+
+    def update(self, canvas, **kwargs) -> bool:
+        """
+        Refreshes the surface from the given data
+
+        :return: surface changed
+        """
         raise NotImplementedError()
 
+    def render(self, canvas, force: bool = False, **kwargs) -> Optional[pygame.Rect]:
+        """
+        Blits the section if it changed
+
+        :param canvas: screen to draw to
+        :param force: blit even without changes, e.g. because something was drawn over it
+        :return: area of the window drawn to, None if nothing was drawn
+        """
+        if not self.update(canvas, **kwargs) and not force:
+            return None
+        return canvas.blit(self.surface, self.position(canvas))
+
 
 class TurnHistorySection(DisplaySection):
     # TODO: make scrollable
@@ -39,9 +67,17 @@ class TurnHistorySection(DisplaySection):
         self.surface = pygame.Surface((rec[0], rec[1] - canvas.get_field_height() + 10))
         self.surface.fill((50, 50, 50))
 
-    def render(self, canvas: Screen, history: Optional[TurnHistory] = None, **kwargs):
+    def position(self, canvas):
+        return 0, canvas.get_field_height() - 5
+
+    def update(self, canvas: Screen, history: Optional[TurnHistory] = None, **kwargs) -> bool:
+        has_changed = False
+        if history is not None and len(history.turns) < len(self.records):
+            # a new game started
+            self.reset()
+            self.surface.fill((50, 50, 50))
+            has_changed = True
         if history and history.turns:
-            has_changed = False
             if len(history.turns) > len(self.records):
                 record_len = len(self.records)
                 self.records.extend([
@@ -61,8 +97,7 @@ class TurnHistorySection(DisplaySection):
 
                 for record in self.records:
                     record.render(self.surface)
-
-        canvas.blit(self.surface, (0, canvas.get_field_height() - 5))
+        return has_changed
 
 
 class StatisticsSection(DisplaySection):
@@ -86,10 +121,52 @@ class StatisticsSection(DisplaySection):
         for field, value in self.heatmap.items():
             screen.draw_text_to_surface(str(value), (10 + 35 * (int(field / 8)), y + 35 * (field%8)), self.surface, color=(value / max_val * 255 if max_val > 0 else 0, 0, 0, 255))
 
-    def render(self, canvas, game=None, **kwargs):
+    def position(self, canvas):
+        return canvas.get_field_width() - 5, 0
+
+    def update(self, canvas, game=None, **kwargs) -> bool:
         if game and game.game_history.data:
             if game.game_history.data != self.data:
                 self.data = game.game_history.data.copy()
                 self.resize(canvas)
+                return True
+        return False
+
+
+class AnalysisSection(DisplaySection):
+    """
+    Shows the latest snapshot of the background analysis, redrawn only if a new iteration arrived
+    """
 
-        canvas.blit(self.surface, (screen.get_field_width()-5, 0))
+    def __init__(self):
+        self.surface = None
+        self.info = None
+        self.searching = False
+
+    def resize(self, canvas):
+        rec = canvas.get_size()
+        self.surface = pygame.Surface((rec[0] - canvas.get_field_width() + 10, 4 * 25 + 10))
+        self.surface.fill((40, 40, 40))
+        screen.draw_text_to_surface(f'Analysis{" ..." if self.searching else ""}', (10, 0), self.surface)
+        if self.info is None:
+            return
+        mate_in = self.info.mate_in
+        score = f'{self.info.score / 100:+.2f}' if mate_in is None else f'#{mate_in}'
+        best_move = self.info.best_move.to_string() if self.info.best_move else '-'
+        screen.draw_text_to_surface(f'depth {self.info.depth}  eval {score}', (10, 25), self.surface)
+        screen.draw_text_to_surface(f'best {best_move}  {self.info.nps} nps', (10, 50), self.surface)
+        screen.draw_text_to_surface(' '.join(move.to_string() for move in self.info.pv[1:8]), (10, 75),
+                                    self.surface)
+
+    def position(self, canvas):
+        return canvas.get_field_width() - 5, canvas.get_field_height() - self.surface.get_height()
+
+    def update(self, canvas, game=None, **kwargs) -> bool:
+        if game and game.analysis:
+            info = game.analysis.snapshot()
+            if info is not self.info or game.analysis.searching != self.searching:
+                self.info = info
+                self.searching = game.analysis.searching
+                self.resize(canvas)
+                return True
+        return False
@@ -1,21 +1,72 @@
-from typing import List, Optional, Tuple
+import math
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from src.figures import Figure, King, Queen, Knight, Pawn, Bishop, Rook
-from src.helpers import sign, Coords
+from src.figures import FieldType, Figure, King, Queen, Knight, Pawn, Bishop, Rook, FIGURE_CLASSES
+from src.helpers import sign, Coords, COORDS
 from src.history import TurnHistory
+from src.move import Move, Undo, PROMOTION_TYPES
+from src.movable import DIAGONAL_DIRECTIONS, KING_TARGETS, KNIGHT_TARGETS, RAY_TILES
+from src.position import WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from src.evaluation import SCORES
+from src.zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
+
+
+# initial king and rook tiles, moves touching them may change castling rights
+CASTLING_TILES = {0, 4, 7, 56, 60, 63}
+
+
+class BoardSnapshot:
+    """
+    Position of a board including the state of every figure object, see `CheckerBoard.snapshot`
+    """
+
+    def __init__(self, board: 'CheckerBoard') -> None:
+        self.board = board
+        self.figures = [(figure, dict(figure.__dict__)) for pieces in board.pieces.values() for figure in pieces]
+        self.is_white_turn = board.is_white_turn
+        self.en_passant_figure = board.en_passant_figure
+        self.hash = board.hash
 
 
 class CheckerBoard:
     fields: List[List[Optional[Figure]]] = list(list())
+    # verify the incremental Zobrist hash against a recomputation after every change
+    debug_hash: bool = False
 
-    def __init__(self, display: Optional['pygame.Surface'], game, skip_init: bool = False) -> None:
+    def __init__(self, display: Optional['pygame.Surface'], game, skip_init: bool = False,
+                 underpromoted_castling: bool = False,
+                 choose_promotion: Optional[Callable[[bool], None]] = None) -> None:
+        """
+        :param display: canvas the board is drawn to, None without drawing
+        :param game: game recording the turns played with `perform_move`
+        :param skip_init: leave the board empty, used by `copy`
+        :param underpromoted_castling: rooks from a promotion may still castle
+        :param choose_promotion: called with True once the player has to pick the figure a pawn gets promoted to
+            and with False once it was picked, a promoted pawn stays a queen without it
+        """
+        self.underpromoted_castling = underpromoted_castling
+        self.choose_promotion = choose_promotion
         # Texture for simple rendering
         self.empty_board: Optional['pygame.Surface'] = None
+        # translucent tile drawn over the tiles a selected figure may move to, sized like `empty_board` tiles
+        self.hint_overlay: Optional['pygame.Surface'] = None
         # cell height and width
         self.cell_size: Optional[Tuple[int]] = None
         # pointer to currently selected figure
         self.selected_figure = None
         self.checked_figure = None
+        # pawn which can currently be captured en-passant
+        self.en_passant_figure: Optional[Figure] = None
+        self.is_white_turn = True
+        # Zobrist hash of the position
+        self.hash = 0
+        # figures on the board by type value (color | piece) and kings by color, kept in sync with `fields`
+        self.pieces: Dict[int, List[Figure]] = dict()
+        self.kings: Dict[bool, Optional[King]] = dict()
+        # running sum of `Figure.value` and centipawn score (values and piece-square tables), positive for white
+        self.material_sum = 0
+        self.score = 0
+        self.clear_pieces()
         if skip_init:
             return
         # Game state
@@ -24,19 +75,28 @@ class CheckerBoard:
         self.canvas = display
         # actual game state
         self.fields: List[List[Optional[Figure]]] = list()
+        # figure type and move highlight per tile as last drawn
+        self.drawn: List[Optional[Tuple[int, bool]]] = [None] * 64
 
-        if self.game.use_pygame:
-            self.init_empty_field_texture()
-
+        # board texture is created on the first `draw`
         self.reset()
 
     def copy(self) -> 'CheckerBoard':
         board = CheckerBoard(None, None, skip_init=True)
         board.game = self.game
+        board.underpromoted_castling = self.underpromoted_castling
+        board.choose_promotion = self.choose_promotion
         board.canvas = self.canvas
         board.empty_board = self.empty_board
+        board.hint_overlay = self.hint_overlay
         board.cell_size = self.cell_size
-        board.fields = self.fields.copy()
+        board.drawn = [None] * 64
+        board.is_white_turn = self.is_white_turn
+        board.hash = self.hash
+        board.fields = [[cell.copy(board) if cell else None for cell in row] for row in self.fields]
+        board.index_figures()
+        if self.en_passant_figure:
+            board.en_passant_figure = board.check_field(self.en_passant_figure.position)
         return board
 
     def check_field(self, move: Coords) -> Optional['Figure']:
@@ -47,20 +107,79 @@ class CheckerBoard:
 
     def rescale(self, canvas: 'pygame.Surface') -> None:
         self.canvas = canvas
-        self.init_empty_field_texture()
+        # recreated in the new size on the next `draw`
+        self.empty_board = None
+        self.invalidate()
 
     def get_figures(self, type_val: int) -> List[Figure]:
         """
         Getter for figures by type value
-        :param type_val:
-        :return:
+        :param type_val: color and figure type, e.g. `FieldType.WHITE | FieldType.ROOK`
+        :return: copy of the piece list
+        """
+        return list(self.pieces.get(type_val, ()))
+
+    def get_pieces(self, is_white: bool) -> List[Figure]:
+        """
+        All figures of a color, ordered by figure type from pawns to king
+        """
+        color = FieldType.WHITE if is_white else FieldType.BLACK
+        return [figure for piece in FIGURE_CLASSES for figure in self.pieces[color | piece]]
+
+    def king_square(self, is_white: bool) -> Optional[int]:
+        """
+        :return: tile index `y * 8 + x` of the king of given color
+        """
+        king = self.kings[is_white]
+        return king.square if king else None
+
+    def material(self) -> int:
+        """
+        Sum of `Figure.value` of all figures on the board, positive values favor white
+        """
+        return self.material_sum
+
+    def evaluate(self) -> int:
+        """
+        Static evaluation in centipawns from the view of the player to move
+        """
+        return self.score if self.is_white_turn else -self.score
+
+    def clear_pieces(self) -> None:
+        self.pieces = {color | piece: list() for color in (FieldType.WHITE, FieldType.BLACK) for piece in FIGURE_CLASSES}
+        self.kings = {True: None, False: None}
+        self.material_sum = 0
+        self.score = 0
+
+    def add_figure(self, figure: Figure) -> None:
         """
-        figures = list()
-        for col in self.fields:
-            for cell in col:
-                if cell and cell.type == type_val:
-                    figures.append(cell)
-        return figures
+        Registers a figure placed on the board in the piece lists and running totals
+        """
+        self.pieces[figure.type].append(figure)
+        self.material_sum += figure.value
+        self.score += SCORES[figure.type][figure.square]
+        if isinstance(figure, King):
+            self.kings[figure.is_white] = figure
+
+    def remove_figure(self, figure: Figure) -> None:
+        """
+        Drops a captured or promoted figure from the piece lists and running totals
+        """
+        self.pieces[figure.type].remove(figure)
+        self.material_sum -= figure.value
+        self.score -= SCORES[figure.type][figure.square]
+        if self.kings[figure.is_white] is figure:
+            self.kings[figure.is_white] = None
+
+    def index_figures(self) -> None:
+        """
+        Rebuilds piece lists, kings and running totals from `fields`, call after replacing `fields` directly
+        """
+        self.clear_pieces()
+        for row in self.fields:
+            for cell in row:
+                if cell:
+                    self.add_figure(cell)
 
     def reset(self, fen_string: str = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR') -> None:
         """
@@ -72,29 +191,40 @@ class CheckerBoard:
         castling: 'r3k2r/8/8/8/8/8/8/R3K2R'
         """
         self.fields = [[None for _ in range(8)] for _ in range(8)]
+        self.clear_pieces()
         self.checked_figure = None
         self.selected_figure = None
+        self.en_passant_figure = None
+        self.is_white_turn = True
         self.load_game_from_string(fen_string)
 
-    def reset_en_passant(self, is_white: bool) -> None:
+    def snapshot(self) -> BoardSnapshot:
         """
-        Resets en-passant pawn state for given color
-        :param is_white: color to clean
+        Records the position, restore it with `restore` instead of rebuilding the figures with `reset`
         """
-        for col in self.fields:
-            for cell in col:
-                if cell and cell.is_white == is_white and cell.en_passant:
-                    cell.en_passant = False
+        return BoardSnapshot(self)
 
-    def reset_castles(self, is_white: bool) -> None:
+    def restore(self, snapshot: BoardSnapshot) -> None:
         """
-        Resets game state for castled kings
-        :param is_white: color to clean
+        Restores a snapshot of this board in place, the recorded figure objects are reused.
+
+        :param snapshot: snapshot taken by this board
         """
-        for col in self.fields:
-            for cell in col:
-                if cell and cell.is_white == is_white and cell.castles_with:
-                    cell.castles_with = None
+        assert snapshot.board is self, 'snapshot of another board'
+        self.fields = fields = [[None] * 8 for _ in range(8)]
+        self.clear_pieces()
+        for figure, state in snapshot.figures:
+            # captured and promoted figures come back as well, their state is overwritten completely
+            figure.__dict__.update(state)
+            fields[figure.square >> 3][figure.square & 7] = figure
+            self.add_figure(figure)
+        self.checked_figure = None
+        self.selected_figure = None
+        self.en_passant_figure = snapshot.en_passant_figure
+        self.is_white_turn = snapshot.is_white_turn
+        self.hash = snapshot.hash
+        if self.debug_hash:
+            self.verify_hash()
 
     def init_empty_field_texture(self, with_text: bool = True) -> None:
         """
@@ -111,6 +241,9 @@ class CheckerBoard:
         # create an empty surface and paint it white
         self.empty_board = pygame.Surface((self.cell_size[0] * 8, self.cell_size[1] * 8))
         self.empty_board.fill(WHITE)
+        self.hint_overlay = pygame.Surface((math.ceil(self.cell_size[0]), math.ceil(self.cell_size[1])),
+                                           pygame.SRCALPHA)
+        self.hint_overlay.fill((0, 0, 0, 100))
 
         def get_elem_rect(_x, _y):
             """Helper method to get scaled coordinates"""
@@ -145,9 +278,13 @@ class CheckerBoard:
             initial setup:
             rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR
 
+        Optionally followed by the remaining FEN fields: player to move, castling rights
+        and en-passant target, e.g. rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1
+
         :param input_string: input string "/"-separated
         """
-        for row, element in enumerate(input_string.split('/')):
+        fen_fields = input_string.split()
+        for row, element in enumerate(fen_fields[0].split('/')):
             index = 0
             col = 0
             while index < len(element):
@@ -182,28 +319,90 @@ class CheckerBoard:
                     figure_class = Rook
 
                 self.fields[row][col-1] = figure_class(Coords(col-1, row), is_white=is_white, _board=self)
+                self.add_figure(self.fields[row][col-1])
                 index += 1
 
-    def draw(self) -> None:
+        if len(fen_fields) > 1:
+            self.is_white_turn = fen_fields[1] == 'w'
+        if len(fen_fields) > 2:
+            self.load_castling_rights(fen_fields[2])
+        if len(fen_fields) > 3 and fen_fields[3] != '-':
+            target = Coords.from_string(fen_fields[3])
+            pawn = self.fields[target.y + (1 if self.is_white_turn else -1)][target.x]
+            if isinstance(pawn, Pawn):
+                pawn.en_passant = True
+                self.en_passant_figure = pawn
+        self.hash = self.compute_hash()
+
+    def load_castling_rights(self, rights: str) -> None:
+        """
+        Marks kings and rooks as moved according to FEN castling rights, e.g. 'KQkq', 'Kq' or '-'
+
+        :param rights: FEN castling field
+        """
+        for row, king_side, queen_side in ((7, 'K', 'Q'), (0, 'k', 'q')):
+            for col, right in ((7, king_side), (0, queen_side)):
+                rook = self.fields[row][col]
+                if isinstance(rook, Rook) and right not in rights:
+                    rook.has_moved = True
+            king = self.fields[row][4]
+            if isinstance(king, King) and king_side not in rights and queen_side not in rights:
+                king.has_moved = True
+
+    def tile_rect(self, square: int) -> 'pygame.Rect':
+        """
+        Area of a tile on the canvas, edges are rounded separately so neighbouring tiles leave no gaps
+        """
+        import pygame
+        width, height = self.cell_size
+        x, y = square & 7, square >> 3
+        left, top = int(x * width), int(y * height)
+        return pygame.Rect(left, top, int((x + 1) * width) - left, int((y + 1) * height) - top)
+
+    def invalidate(self) -> None:
+        """
+        Redraws every tile on the next `draw`, e.g. after something was drawn over the board
+        """
+        self.drawn = [None] * 64
+
+    def draw(self, full: bool = True) -> List['pygame.Rect']:
         """
         Renders the board into the global window.
 
-        Renders board texture and skips empty fields for efficiency.
+        Only tiles whose figure or move highlight changed since the last call are redrawn.
+
+        :param full: redraw every tile
+        :return: areas of the window drawn to
         """
         from src.backends.screen import screen
-        self.canvas.blit(self.empty_board, self.empty_board.get_rect())
-
-        for row in self.fields:
-            for field in filter(lambda i: i is not None, row):
-                screen.draw_figure(
-                    field.type,
-                    ((.25+field.position.x) * self.cell_size[0],
-                     field.position.y * self.cell_size[1]),
-                    surface=self.canvas
-                )
-                if field.is_selected:
-                    field.draw_allowed_moves(self.canvas)
-        screen.blit(self.canvas, self.canvas.get_rect())
+        if self.empty_board is None:
+            self.init_empty_field_texture()
+            full = True
+
+        figure = self.selected_figure
+        hints = figure.move_hints() if figure is not None and figure.is_selected else set()
+        width, height = self.cell_size
+        drawn = self.drawn
+        redrawn = list()
+        rects = list()
+        for square in range(64):
+            field = self.fields[square >> 3][square & 7]
+            state = (field.type if field else FieldType.EMPTY, square in hints)
+            if not full and drawn[square] == state:
+                continue
+            drawn[square] = state
+            rect = self.tile_rect(square)
+            self.canvas.blit(self.empty_board, rect, rect)
+            if field:
+                screen.draw_figure(field.type, ((.25 + (square & 7)) * width, (square >> 3) * height),
+                                   surface=self.canvas)
+            redrawn.append(square)
+            rects.append(rect)
+
+        highlighted = [square for square in redrawn if square in hints]
+        if highlighted:
+            figure.draw_allowed_moves(self.canvas, highlighted)
+        return [screen.blit(self.canvas, rect, rect) for rect in rects]
 
     def handle_figure_selection(self, cols: int, rows: int, is_white_turn: bool) -> None:
         """
@@ -233,84 +432,493 @@ class CheckerBoard:
         Handles figure placement in board
 
         Call to place a figure to the given position.
+        Only legal moves are performed, castling is done by placing the king on the rook or two tiles towards it.
         :param cols: selected column
         :param rows:  selected row
         :param is_white_turn:
         :return: placement successful
         """
-        old_pos = self.selected_figure.position
-        reset = (old_pos - Coords(cols, rows)).len == 0
-
-        if not reset and self.selected_figure.move(Coords(cols, rows)):
-            prev_fig_pos = Coords(cols, rows)
-            # en-passant
-            if self.selected_figure.checked_en_passant:
-                prev_fig_pos = Coords(cols, old_pos.row)
-            # castling
-            elif self.selected_figure.castles_with is not None:
-                prev_fig_pos = self.selected_figure.castles_with.position
-
-            self.checked_figure = self.fields[prev_fig_pos.row][prev_fig_pos.col]
-            self.selected_figure.checked_en_passant = False
-            if self.checked_figure and self.checked_figure.checkmate():
-                self.game.backend.needs_render_selector = False
-                self.game.running = False
-                if not self.game.history.is_final:
-                    if is_white_turn:
-                        key = 'White'
-                    else:
-                        key = 'Black'
-                    self.game.game_history.data[key] += 1
-                print(f'Game over {"White" if is_white_turn else "Black"} wins.')
-
-            if self.selected_figure.castles_with:
-                # perform switch during castling
-                direction = sign(self.selected_figure.position.x - old_pos.x)
-                self.fields[old_pos.y][cols - 2 * direction] = self.selected_figure.castles_with
-                self.selected_figure.castles_with.position = Coords(cols - 2 * direction, old_pos.y)
-                cols -= direction
-
-            self.fields[old_pos.row][old_pos.col] = None
-            self.fields[prev_fig_pos.row][prev_fig_pos.col] = None
-            self.selected_figure.position = Coords(cols, rows)
-            self.fields[rows][cols] = self.selected_figure
-
-            if not self.game.backend.needs_render_selector:
-                self.game.history.record(self.selected_figure, old_pos, Coords(cols, rows), self.checked_figure)
-        else:
-            reset = True
-
-        self.fields[self.selected_figure.position.row][self.selected_figure.position.col].is_selected = False
-        if not self.game.backend.needs_render_selector:
+        figure = self.selected_figure
+        figure.is_selected = False
+        move = self.find_move(figure, Coords(cols, rows))
+        if move is None:
             self.selected_figure = None
-        if reset:
             return False
 
-        self.reset_en_passant(not is_white_turn)
-        self.reset_castles(not is_white_turn)
+        self.perform_move(move, select_promotion=True)
         return True
 
-    def handle_figure_promotion(self, cols: int, rows: int) -> None:
+    def perform_move(self, move: Move, select_promotion: bool = False) -> Undo:
+        """
+        Plays a legal move as a game turn: applies it, records it in the history and detects the game end.
+
+        :param move: legal move of the player to move
+        :param select_promotion: let the player pick the promotion in the figure selector,
+            otherwise and on boards without `choose_promotion` the figure of `move.promotion` is kept
+        :return: undo record of the move
+        """
+        figure = self.fields[move.start >> 3][move.start & 7]
+        old_pos = figure.position
+        undo = self.make_move(move)
+        self.checked_figure = undo.captured
+        self.selected_figure = None
+
+        if undo.promoted:
+            if select_promotion and self.choose_promotion is not None:
+                # figure gets replaced once the player picked the promotion
+                self.selected_figure = undo.promoted
+                self.request_promotion()
+                return undo
+            is_checkmate = self.handle_game_over()
+            self.game.history.record(undo.promoted, undo.promoted.prev_position, undo.promoted.position, None,
+                                     is_promotion=True, is_checkmate=is_checkmate)
+            return undo
+
+        is_checkmate = self.handle_game_over()
+        # history detects castling by the rook the king castled with
+        figure.castles_with = undo.rook
+        self.game.history.record(figure, old_pos, COORDS[move.end], self.checked_figure, is_checkmate=is_checkmate)
+        figure.castles_with = None
+        return undo
+
+    def find_move(self, figure: Figure, target: Coords) -> Optional[Move]:
+        """
+        Looks up the legal move of a figure onto a target tile.
+
+        Placing the king onto an own rook translates into castling, promotions default to a queen.
+
+        :param figure: figure to move
+        :param target: target tile
+        :return: the legal move or None
+        """
+        start, end = figure.square, target.index
+        target_figure = self.fields[target.y][target.x]
+        if (isinstance(figure, King) and isinstance(target_figure, Rook) and target_figure.is_white == figure.is_white
+                and target.y == figure.position.y and target.x in (0, 7) and not target_figure.has_moved):
+            end = start + 2 * sign(target.x - figure.position.x)
+
+        for move in self.legal_moves():
+            if (move.start == start and move.end == end
+                    and move.promotion in (FieldType.EMPTY, FieldType.QUEEN)):
+                return move
+        return None
+
+    def handle_game_over(self) -> bool:
+        """
+        Ends the game if the player to move has no legal moves left.
+
+        :return: game ended in checkmate
+        """
+        if self.legal_moves():
+            return False
+
+        self.game.running = False
+        if not self.is_check():
+            self.game.backend.show_result('Game over, stalemate.')
+            return False
+
+        key = 'Black' if self.is_white_turn else 'White'
+        if not self.game.history.is_final:
+            data = self.game.game_history.data
+            data[key] = data.get(key, 0) + 1
+        self.game.backend.show_result(f'Game over {key} wins.')
+        return True
+
+    def promote(self, fig_class: type) -> None:
+        """
+        Replaces the freshly promoted figure with a figure of given class
+
+        :param fig_class: class of the figure to promote to
+        """
+        promoted = self.selected_figure
+        figure = fig_class(promoted.position, is_white=promoted.is_white, _board=self)
+
+        # figure.has_moved disables/enables Rook's castling mechanics
+        # in case selected figure is queen.
+        figure.has_moved = not self.underpromoted_castling
+        figure.prev_position = promoted.prev_position
+        index = figure.square
+        self.fields[index >> 3][index & 7] = figure
+        self.remove_figure(promoted)
+        self.add_figure(figure)
+        self.hash ^= PIECE_KEYS[promoted.type][index] ^ PIECE_KEYS[figure.type][index]
+        if self.debug_hash:
+            self.verify_hash()
+        self.selected_figure = None
+        if self.choose_promotion is not None:
+            self.choose_promotion(False)
+
+        is_checkmate = self.handle_game_over()
+        self.game.history.record(figure, figure.prev_position, figure.position, None, is_promotion=True,
+                                 is_checkmate=is_checkmate)
+
+    def request_promotion(self) -> None:
+        """
+        Lets the player pick the figure a pawn on the last row gets promoted to
+        """
+        if self.choose_promotion is not None:
+            self.choose_promotion(True)
+
+    def handle_figure_promotion(self, cols: int, rows: int, selector: 'FigureSelector') -> None:
         """
         Handles Pawn-promotion in place.
 
         :param cols: selected column
         :param rows: selected row
+        :param selector: figure selector the player picked from
         """
         if rows > 1 or cols > 1:
             print('Error selecting...\nRetry!')
-        fig_class = self.game.figure_selector.select(rows * 2 + cols)
-        figure = fig_class(self.selected_figure.position, is_white=self.selected_figure.is_white, _board=self)
+        self.promote(selector.select(rows * 2 + cols))
 
-        # figure.has_moved disables/enables Rook's castling mechanics
-        # in case selected figure is queen.
-        figure.has_moved = not self.game.underpromoted_castling
-        figure.prev_position = self.selected_figure.prev_position
-        self.fields[self.selected_figure.position.row][self.selected_figure.position.col] = figure
-        self.game.history.record(figure, figure.prev_position, figure.position, None, is_promotion=True)
-        self.selected_figure = None
-        self.game.backend.needs_render_selector = False
-        self.game.is_white_turn = not self.game.is_white_turn
+    def get_king(self, is_white: bool) -> Optional[King]:
+        return self.kings[is_white]
+
+    def is_attacked(self, tile: int, by_white: bool) -> bool:
+        """
+        Tests if any figure of given color attacks a tile
+
+        :param tile: tile index `y * 8 + x` to test
+        :param by_white: color of the attacking figures
+        """
+        fields = self.fields
+        for direction in range(8):
+            diagonal = direction in DIAGONAL_DIRECTIONS
+            for field in RAY_TILES[direction][tile]:
+                cell = fields[field >> 3][field & 7]
+                if cell is None:
+                    continue
+                if cell.is_white == by_white and (
+                        isinstance(cell, Queen) or isinstance(cell, Bishop if diagonal else Rook)):
+                    return True
+                break
+        for field in KNIGHT_TARGETS[tile]:
+            cell = fields[field >> 3][field & 7]
+            if cell is not None and cell.is_white == by_white and isinstance(cell, Knight):
+                return True
+        for field in KING_TARGETS[tile]:
+            cell = fields[field >> 3][field & 7]
+            if cell is not None and cell.is_white == by_white and isinstance(cell, King):
+                return True
+        # pawns attack towards their moving direction
+        x, pawn_y = tile & 7, (tile >> 3) + (1 if by_white else -1)
+        if 0 <= pawn_y < 8:
+            for pawn_x in (x - 1, x + 1):
+                if 0 <= pawn_x < 8:
+                    cell = fields[pawn_y][pawn_x]
+                    if cell is not None and cell.is_white == by_white and isinstance(cell, Pawn):
+                        return True
+        return False
+
+    def is_capture(self, move: Move) -> bool:
+        """
+        :return: move captures a figure, including en-passant
+        """
+        fields = self.fields
+        if fields[move.end >> 3][move.end & 7] is not None:
+            return True
+        # only pawns change their column without a figure on the target tile when capturing
+        return (move.start - move.end) & 7 != 0 and isinstance(fields[move.start >> 3][move.start & 7], Pawn)
+
+    def is_check(self) -> bool:
+        """
+        :return: king of the player to move is in check
+        """
+        king = self.get_king(self.is_white_turn)
+        return king is not None and self.is_attacked(king.square, not king.is_white)
+
+    def get_checks_and_pins(self, king: King) -> Tuple[List[Tuple[Figure, Set[int]]], Dict[Figure, Set[int]]]:
+        """
+        Computes checking figures and pinned figures of the king's color.
+
+        Tiles are given as indices `y * 8 + x`.
+
+        :param king: king to test, without a king nothing is checked or pinned
+        :return: list of checkers with the tiles resolving the check (capture or block),
+            and pinned figures mapped to the tiles they may still move to
+        """
+        if king is None:
+            return list(), dict()
+        fields = self.fields
+        is_white = king.is_white
+        index = king.square
+        checkers = list()
+        pins = dict()
+        for direction in range(8):
+            diagonal = direction in DIAGONAL_DIRECTIONS
+            line = set()
+            pinned = None
+            for field in RAY_TILES[direction][index]:
+                line.add(field)
+                cell = fields[field >> 3][field & 7]
+                if cell is None:
+                    continue
+                if cell.is_white == is_white:
+                    if pinned is not None:
+                        break
+                    pinned = cell
+                    continue
+                if isinstance(cell, Queen) or isinstance(cell, Bishop if diagonal else Rook):
+                    if pinned is None:
+                        checkers.append((cell, line))
+                    else:
+                        pins[pinned] = line
+                break
+
+        for field in KNIGHT_TARGETS[index]:
+            cell = fields[field >> 3][field & 7]
+            if cell is not None and cell.is_white != is_white and isinstance(cell, Knight):
+                checkers.append((cell, {field}))
+
+        x, pawn_y = index & 7, (index >> 3) + (-1 if is_white else 1)
+        if 0 <= pawn_y < 8:
+            for pawn_x in (x - 1, x + 1):
+                if 0 <= pawn_x < 8:
+                    cell = fields[pawn_y][pawn_x]
+                    if cell is not None and cell.is_white != is_white and isinstance(cell, Pawn):
+                        checkers.append((cell, {pawn_y * 8 + pawn_x}))
+        return checkers, pins
+
+    def legal_moves(self, captures_only: bool = False) -> List[Move]:
+        """
+        Generates all legal moves of the player to move.
+
+        Checkers and pinned figures are computed once, candidate moves are filtered against them,
+        only en-passant captures are verified by performing them.
+
+        :param captures_only: only generate captures and promotions, used by the quiescence search
+        """
+        fields = self.fields
+        is_white = self.is_white_turn
+        king = self.get_king(is_white)
+        checkers, pins = self.get_checks_and_pins(king)
+        check_tiles = checkers[0][1] if len(checkers) == 1 else None
+        moves = list()
+
+        if len(checkers) < 2:
+            color = FieldType.WHITE if is_white else FieldType.BLACK
+            figures = [figure for piece in PROMOTION_TYPES + (FieldType.PAWN,) for figure in self.pieces[color | piece]]
+            for figure in figures:
+                start = figure.square
+                pinned_tiles = pins.get(figure)
+                is_pawn = isinstance(figure, Pawn)
+                for target in figure.targets():
+                    if is_pawn and (target - start) & 7 and fields[target >> 3][target & 7] is None and king:
+                        # en-passant may uncover the king along the row, simply try it
+                        move = Move(start, target)
+                        undo = self.make_move(move)
+                        if not self.is_attacked(king.square, not is_white):
+                            moves.append(move)
+                        self.unmake_move(undo)
+                        continue
+                    if pinned_tiles is not None and target not in pinned_tiles:
+                        continue
+                    if check_tiles is not None and target not in check_tiles:
+                        continue
+                    if captures_only and fields[target >> 3][target & 7] is None and not (
+                            is_pawn and (target < 8 or target >= 56)):
+                        continue
+                    if is_pawn and (target < 8 or target >= 56):
+                        moves.extend(Move(start, target, promotion) for promotion in PROMOTION_TYPES)
+                    else:
+                        moves.append(Move(start, target))
+
+        if king is None:
+            # positions set up without a king, e.g. from a FEN, have no checks to respect
+            return moves
+
+        # the king must not hide behind itself from sliding attackers
+        start = king.square
+        row = start >> 3
+        fields[row][start & 7] = None
+        for target in king.targets():
+            if captures_only and fields[target >> 3][target & 7] is None:
+                continue
+            if not self.is_attacked(target, not is_white):
+                moves.append(Move(start, target))
+        fields[row][start & 7] = king
+
+        if not captures_only and not checkers and not king.has_moved and start == (60 if is_white else 4):
+            for rook_x, empty, passed in ((7, (5, 6), (5, 6)), (0, (1, 2, 3), (3, 2))):
+                rook = fields[row][rook_x]
+                if (isinstance(rook, Rook) and rook.is_white == is_white and not rook.has_moved
+                        and all(fields[row][x] is None for x in empty)
+                        and not any(self.is_attacked(row * 8 + x, not is_white) for x in passed)):
+                    moves.append(Move(start, row * 8 + passed[-1]))
+        return moves
+
+    def make_move(self, move: Move) -> Undo:
+        """
+        Applies a move without any validation or UI state changes and passes the turn.
+
+        Handles captures, en-passant, castling (king moving two tiles) and promotions.
+
+        :param move: move to perform
+        :return: undo record to revert the move with `unmake_move`
+        """
+        fields = self.fields
+        start, end = move.start, move.end
+        start_x, start_y, end_x, end_y = start & 7, start >> 3, end & 7, end >> 3
+        figure = fields[start_y][start_x]
+        captured = fields[end_y][end_x]
+        undo = Undo(move, figure, captured, figure.has_moved, figure.prev_position,
+                    getattr(figure, 'can_castle', False), self.en_passant_figure, self.hash)
+        undo.material = self.material_sum
+        undo.score = self.score
+
+        zobrist = self.hash ^ SIDE_KEY ^ PIECE_KEYS[figure.type][start]
+        updates_castling = start in CASTLING_TILES or end in CASTLING_TILES
+        if updates_castling:
+            zobrist ^= CASTLING_KEYS[self.castling_rights()]
+        if captured:
+            zobrist ^= PIECE_KEYS[captured.type][end]
+            self.remove_figure(captured)
+
+        if self.en_passant_figure:
+            zobrist ^= EN_PASSANT_KEYS[self.en_passant_figure.square & 7]
+            self.en_passant_figure.en_passant = False
+            self.en_passant_figure = None
+
+        fields[start_y][start_x] = None
+        if isinstance(figure, Pawn):
+            if captured is None and start_x != end_x:
+                undo.captured = fields[start_y][end_x]
+                fields[start_y][end_x] = None
+                self.remove_figure(undo.captured)
+                zobrist ^= PIECE_KEYS[undo.captured.type][start_y * 8 + end_x]
+            elif abs(end_y - start_y) == 2:
+                figure.en_passant = True
+                self.en_passant_figure = figure
+                zobrist ^= EN_PASSANT_KEYS[end_x]
+        elif isinstance(figure, King):
+            figure.can_castle = False
+            if abs(end_x - start_x) == 2:
+                rook_x, rook_end_x = (7, end_x - 1) if end_x > start_x else (0, end_x + 1)
+                rook = fields[start_y][rook_x]
+                undo.rook = rook
+                undo.rook_has_moved = rook.has_moved
+                fields[start_y][rook_x] = None
+                fields[start_y][rook_end_x] = rook
+                rook.square = start_y * 8 + rook_end_x
+                rook.has_moved = True
+                zobrist ^= PIECE_KEYS[rook.type][start_y * 8 + rook_x] ^ PIECE_KEYS[rook.type][rook.square]
+                self.score += SCORES[rook.type][rook.square] - SCORES[rook.type][start_y * 8 + rook_x]
+
+        figure.prev_position = COORDS[start]
+        figure.square = end
+        figure.has_moved = True
+        self.score += SCORES[figure.type][end] - SCORES[figure.type][start]
+        if move.promotion:
+            promoted = FIGURE_CLASSES[move.promotion](COORDS[end], is_white=figure.is_white, _board=self)
+            promoted.has_moved = not self.underpromoted_castling
+            promoted.prev_position = COORDS[start]
+            undo.promoted = promoted
+            fields[end_y][end_x] = promoted
+            self.remove_figure(figure)
+            self.add_figure(promoted)
+            zobrist ^= PIECE_KEYS[promoted.type][end]
+        else:
+            fields[end_y][end_x] = figure
+            zobrist ^= PIECE_KEYS[figure.type][end]
+        if updates_castling:
+            zobrist ^= CASTLING_KEYS[self.castling_rights()]
+        self.hash = zobrist
+        self.is_white_turn = not figure.is_white
+        if self.debug_hash:
+            self.verify_hash()
+        return undo
+
+    def unmake_move(self, undo: Undo) -> None:
+        """
+        Reverts a move performed by `make_move`
+
+        :param undo: record returned by `make_move`
+        """
+        fields = self.fields
+        figure = undo.figure
+        start, end = undo.move.start, undo.move.end
+
+        if undo.move.promotion:
+            # the figure picked in the UI may have replaced the promoted one
+            self.remove_figure(fields[end >> 3][end & 7])
+            self.add_figure(figure)
+        fields[end >> 3][end & 7] = None
+        figure.square = start
+        figure.prev_position = undo.prev_position
+        figure.has_moved = undo.has_moved
+        figure.en_passant = False
+        fields[start >> 3][start & 7] = figure
+        if isinstance(figure, King):
+            figure.can_castle = undo.can_castle
+
+        if undo.captured:
+            captured = undo.captured.square
+            fields[captured >> 3][captured & 7] = undo.captured
+            self.add_figure(undo.captured)
+
+        if undo.rook:
+            rook = undo.rook
+            fields[rook.square >> 3][rook.square & 7] = None
+            rook.square = (start & ~7) | (7 if end > start else 0)
+            rook.has_moved = undo.rook_has_moved
+            fields[rook.square >> 3][rook.square & 7] = rook
+
+        self.en_passant_figure = undo.en_passant_figure
+        if self.en_passant_figure:
+            self.en_passant_figure.en_passant = True
+        self.is_white_turn = figure.is_white
+        self.hash = undo.hash
+        self.material_sum = undo.material
+        self.score = undo.score
+        if self.debug_hash:
+            self.verify_hash()
+
+    def castling_rights(self) -> int:
+        """
+        Castling rights bit mask derived from unmoved kings and rooks on their initial tiles
+        """
+        fields = self.fields
+        rights = 0
+        for row, is_white, king_side, queen_side in ((7, True, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                     (0, False, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = fields[row][4]
+            if not isinstance(king, King) or king.is_white != is_white or king.has_moved:
+                continue
+            for col, right in ((7, king_side), (0, queen_side)):
+                rook = fields[row][col]
+                if isinstance(rook, Rook) and rook.is_white == is_white and not rook.has_moved:
+                    rights |= right
+        return rights
+
+    def compute_hash(self) -> int:
+        """
+        Computes the Zobrist hash of the position from scratch
+        """
+        zobrist = 0
+        for row in self.fields:
+            for cell in row:
+                if cell:
+                    zobrist ^= PIECE_KEYS[cell.type][cell.square]
+        if not self.is_white_turn:
+            zobrist ^= SIDE_KEY
+        if self.en_passant_figure:
+            zobrist ^= EN_PASSANT_KEYS[self.en_passant_figure.square & 7]
+        return zobrist ^ CASTLING_KEYS[self.castling_rights()]
+
+    def verify_hash(self) -> None:
+        """
+        Compares the incrementally updated hash against a recomputation, used in `debug_hash` mode
+        """
+        expected = self.compute_hash()
+        assert self.hash == expected, f'Zobrist hash mismatch: {self.hash:016x} != {expected:016x}'
+
+    def set_turn(self, is_white: bool) -> None:
+        """
+        Sets the player to move, keeping the hash up to date
+        """
+        if is_white != self.is_white_turn:
+            self.hash ^= SIDE_KEY
+        self.is_white_turn = is_white
 
     def handle_mouse_click(self, cols: int, rows: int, is_white_turn: bool) -> bool:
         """
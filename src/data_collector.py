@@ -1,13 +1,14 @@
 import pprint
-from typing import Set, Optional
+from typing import Dict, List, Optional
 
+from src.backends.base import NullBackend
 from src.game import Game
-from src.history import Turn
+from src.helpers import Coords, COORDS
 
 
 class Collector:
     def __init__(self, max_depth: int = 10):
-        self.game = Game(use_pygame=False)
+        self.game = Game(backend=NullBackend)
         self.max_depth = max_depth
 
     def init(self, fen_string, white_moves: bool = True):
@@ -16,31 +17,27 @@ class Collector:
         self.game.is_white_turn = white_moves
 
     def collect(self):
-        current_state = self.game.copy()
-        return self.collect_depth(0, current_state)
+        return self.collect_depth(0)
 
-    def collect_depth(self, current_depth, current_state, moves: Optional[Set[Turn]] = None):
+    def collect_depth(self, current_depth, moves: Optional[Dict[int, Dict[Coords, List[Coords]]]] = None):
         if moves is None:
             moves = {}
 
         if current_depth == self.max_depth:
             return moves
 
-        moves[current_depth] = dict()
+        tiles = moves.setdefault(current_depth, dict())
 
-        for row in current_state.board.fields:
-            for field in filter(lambda x: x is not None, row):
-                for move in field.remove_set(field.allowed_moves):
-                    new_state = current_state.copy()
-                    new_state.handle_mouse_click(field.position.col, field.position.row)
-                    new_state.handle_mouse_click(move.col, move.row)
+        board = self.game.board
+        for move in board.legal_moves():
+            # promotions to different figures share their target tile
+            targets = tiles.setdefault(COORDS[move.start], [])
+            if COORDS[move.end] not in targets:
+                targets.append(COORDS[move.end])
 
-                    if field.position in moves and move in moves[field.position]:
-                        moves[current_depth][field.position].append(move)
-                    else:
-                        moves[current_depth][field.position] = [move]
-
-                    self.collect_depth(current_depth + 1, new_state, moves)
+            undo = board.make_move(move)
+            self.collect_depth(current_depth + 1, moves)
+            board.unmake_move(undo)
 
         return moves
 
@@ -0,0 +1,2 @@
+from src.engine.search import Searcher, SearchInfo, SearchLimits, MATE, INFINITY, MAX_PLY
+from src.engine.parallel import ParallelSearch
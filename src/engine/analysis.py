@@ -0,0 +1,126 @@
+import multiprocessing
+import queue
+from typing import List, Optional
+
+from src.board import CheckerBoard
+from src.engine.parallel import search_worker
+from src.engine.search import SearchInfo, SearchLimits, MAX_PLY
+from src.position import Position
+from src.transposition import TranspositionTable
+
+
+class Analysis:
+    """
+    Continuous analysis of the displayed position in a separate process, so the search never
+    blocks the game loop.
+
+    The worker posts every completed iteration tagged with the hash of its position, the game loop
+    only calls `follow` and `snapshot`, which never block. A position change signals the running
+    search to stop and starts a new one right away, the stopped worker is reaped once it exited
+    and its remaining results are dropped by their position key.
+
+    The worker searches with a transposition table in shared memory, it is kept across positions,
+    so the analysis of the next position and searches in this process profit from its entries.
+
+    :param hash_size: size of the shared transposition table in MB
+    :param depth: depth at which the analysis of a position ends
+    :param table: shared transposition table to use instead of allocating one
+    """
+
+    def __init__(self, hash_size: float = 16, depth: int = MAX_PLY,
+                 table: Optional[TranspositionTable] = None) -> None:
+        assert table is None or table.shared, 'the analysis process needs a shared table'
+        self.depth = depth
+        self.owns_table = table is None
+        self.table = table or TranspositionTable(hash_size, shared=True)
+        self.context = multiprocessing.get_context()
+        self.results = self.context.Queue()
+        self.process = None
+        self.stop_event = None
+        # stopped workers which did not exit yet
+        self.stopping: List[multiprocessing.Process] = list()
+        self.key: Optional[int] = None
+        self.latest: Optional[SearchInfo] = None
+        self.searching = False
+
+    def follow(self, board: CheckerBoard) -> None:
+        """
+        Restarts the analysis if the position of `board` changed since the last call
+        """
+        if board.hash != self.key:
+            self.start(board)
+
+    def start(self, board: CheckerBoard) -> None:
+        """
+        Starts analysing the position of `board`, the board is left untouched
+        """
+        self.stop()
+        self.key = board.hash
+        self.latest = None
+        self.searching = True
+        self.stop_event = self.context.Event()
+        self.process = self.context.Process(
+            target=search_worker, daemon=True,
+            args=(Position.from_board(board), self.table, SearchLimits(self.depth), self.key, self.results,
+                  self.stop_event, 1))
+        self.process.start()
+
+    def collect(self) -> None:
+        """
+        Collects the posted iterations of the current position without blocking
+        """
+        while True:
+            try:
+                key, info = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if key != self.key:
+                # left over by the search of a previous position
+                continue
+            if info is None:
+                self.searching = False
+            else:
+                self.latest = info
+
+    def snapshot(self) -> Optional[SearchInfo]:
+        """
+        Collects the posted iterations and reaps stopped workers without blocking
+
+        :return: deepest completed iteration of the current position, None if none completed yet
+        """
+        self.collect()
+        if self.stopping:
+            self.stopping = [process for process in self.stopping if process.is_alive()]
+        return self.latest
+
+    def stop(self, wait: bool = False) -> None:
+        """
+        Signals the running search to stop
+
+        :param wait: block until every stopped worker exited, so `latest` holds the final iteration,
+            otherwise workers are reaped by later calls of `snapshot`
+        """
+        if self.process is not None:
+            self.stop_event.set()
+            self.stopping.append(self.process)
+            self.process = None
+            self.stop_event = None
+            self.searching = False
+        if not wait:
+            return
+        for process in self.stopping:
+            while process.is_alive():
+                # keep the queue drained, the worker only exits once its results are flushed
+                self.collect()
+                process.join(0.01)
+        self.collect()
+        self.stopping = list()
+
+    def close(self) -> None:
+        """
+        Stops all workers and releases a table allocated by the analysis
+        """
+        self.stop(wait=True)
+        self.key = None
+        if self.owns_table:
+            self.table.close()
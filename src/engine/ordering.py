@@ -0,0 +1,89 @@
+from typing import List, Optional
+
+from src.board import CheckerBoard
+from src.move import Move
+
+
+class MoveOrdering:
+    """
+    Sorts moves so that the ones most likely to cause a beta cutoff are searched first:
+    the hash move, captures by MVV-LVA, promotions, killer moves and finally quiet moves by history.
+
+    MVV-LVA ("most valuable victim, least valuable attacker") uses the `Figure.value` scale.
+
+    :param max_ply: number of plies killer moves are kept for
+    """
+    HASH_MOVE = 1 << 30
+    CAPTURE = 1 << 28
+    PROMOTION = 1 << 27
+    KILLER = 1 << 26
+
+    def __init__(self, max_ply: int) -> None:
+        self.killers: List[List[Optional[Move]]] = [[None, None] for _ in range(max_ply + 1)]
+        # indexed by `start * 64 + end`
+        self.history: List[int] = [0] * 4096
+
+    def clear(self) -> None:
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+        self.history = [0] * 4096
+
+    def age(self) -> None:
+        """
+        Halves the history scores, called between iterations so recent cutoffs weigh more
+        """
+        self.history = [value >> 1 for value in self.history]
+
+    @staticmethod
+    def capture_score(board: CheckerBoard, move: Move) -> int:
+        """
+        MVV-LVA score of a capture, en-passant counts as capturing a pawn
+        """
+        fields = board.fields
+        attacker = fields[move.start >> 3][move.start & 7]
+        victim = fields[move.end >> 3][move.end & 7]
+        victim_value = abs(victim.value) if victim else 1
+        return victim_value * 16 - abs(attacker.value)
+
+    def order(self, board: CheckerBoard, moves: List[Move], ply: int, hash_move: int = 0) -> List[Move]:
+        """
+        Sorts moves in place, best candidates first
+
+        :param board: board the moves belong to
+        :param moves: legal moves of the position
+        :param ply: distance to the root, selects the killer moves
+        :param hash_move: encoded best move stored in the transposition table, 0 for none
+        :return: the sorted moves
+        """
+        killers = self.killers[ply]
+        history = self.history
+
+        def score(move: Move) -> int:
+            if hash_move and move.encode() == hash_move:
+                return self.HASH_MOVE
+            if board.is_capture(move):
+                return self.CAPTURE + self.capture_score(board, move)
+            if move.promotion:
+                return self.PROMOTION + move.promotion
+            if move == killers[0]:
+                return self.KILLER + 1
+            if move == killers[1]:
+                return self.KILLER
+            return history[move.start * 64 + move.end]
+
+        moves.sort(key=score, reverse=True)
+        return moves
+
+    def update(self, move: Move, depth: int, ply: int) -> None:
+        """
+        Remembers a quiet move which caused a beta cutoff
+
+        :param move: move causing the cutoff
+        :param depth: remaining depth of the node, deeper cutoffs weigh more
+        :param ply: distance to the root
+        """
+        killers = self.killers[ply]
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move.start * 64 + move.end] += depth * depth
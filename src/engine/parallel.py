@@ -0,0 +1,160 @@
+import multiprocessing
+import queue
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.board import CheckerBoard
+from src.engine.search import Searcher, SearchInfo, SearchLimits, MATE_BOUND
+from src.position import Position
+from src.transposition import TranspositionTable
+
+
+class WorkerSearcher(Searcher):
+    """
+    Searcher of a worker process, additionally stops once the main process sets `stop_event`
+    """
+
+    def __init__(self, board: CheckerBoard, table: TranspositionTable, stop_event, **kwargs) -> None:
+        super().__init__(board, table, **kwargs)
+        self.stop_event = stop_event
+
+    def check_limits(self) -> None:
+        super().check_limits()
+        if self.stop_event.is_set():
+            self.stopped = True
+
+
+def search_worker(position: Position, table: TranspositionTable, limits: SearchLimits, worker_id: int,
+                  results, stop_event, start_depth: Optional[int] = None) -> None:
+    """
+    Entry point of a worker process, posts `(worker_id, SearchInfo)` per completed iteration
+    and `(worker_id, None)` when done.
+
+    :param worker_id: tag of the posted results
+    :param start_depth: depth of the first iteration, by default every other worker skips the first depth,
+        so the workers spread over neighbouring depths
+    """
+    from src.backends.base import NullBackend
+    from src.game import Game
+
+    game = Game(backend=NullBackend)
+    position.to_board(game.board)
+    searcher = WorkerSearcher(game.board, table, stop_event, on_iteration=lambda info: results.put((worker_id, info)))
+    searcher.search(limits, start_depth=1 + worker_id % 2 if start_depth is None else start_depth)
+    results.put((worker_id, None))
+
+
+class ParallelSearch:
+    """
+    Lazy SMP: N worker processes search the same root independently and only share a transposition table
+    in shared memory. Results of one worker let the others cut their trees, the deepest completed
+    iteration of any worker is the result.
+
+    Limits apply per worker, the search ends once any worker completed the maximum depth.
+
+    :param board: board to search, left untouched
+    :param workers: number of worker processes
+    :param hash_size: size of the shared transposition table in MB
+    :param on_iteration: called with every new deepest `SearchInfo`, nodes summed over all workers
+    """
+
+    def __init__(self, board: CheckerBoard, workers: int = 2, hash_size: float = 16,
+                 on_iteration: Optional[Callable[[SearchInfo], None]] = None) -> None:
+        self.board = board
+        self.workers = max(1, workers)
+        self.table = TranspositionTable(hash_size, shared=True)
+        self.on_iteration = on_iteration
+        self.stop_event = None
+
+    def stop(self) -> None:
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def close(self) -> None:
+        """
+        Releases the shared transposition table
+        """
+        self.table.close()
+
+    def search(self, limits: Optional[SearchLimits] = None) -> Optional[SearchInfo]:
+        """
+        Runs the workers until a limit is reached
+
+        :param limits: search limits of every worker
+        :return: deepest completed iteration, None if no worker completed one
+        """
+        limits = limits or SearchLimits()
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        self.stop_event = context.Event()
+        self.table.new_search()
+        position = Position.from_board(self.board)
+        start = time.time()
+
+        processes = [
+            context.Process(target=search_worker, daemon=True,
+                            args=(position, self.table, limits, worker_id, results, self.stop_event))
+            for worker_id in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        best = None
+        nodes = dict()
+        running = self.workers
+        while running:
+            try:
+                worker_id, info = results.get(timeout=0.1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if info is None:
+                running -= 1
+                continue
+            nodes[worker_id] = info.nodes
+            if best is not None and info.depth <= best.depth:
+                continue
+            best = SearchInfo(info.depth, info.score, sum(nodes.values()), time.time() - start, info.pv,
+                              info.statistics)
+            if self.on_iteration:
+                self.on_iteration(best)
+            if info.depth >= limits.depth or not info.pv or abs(info.score) >= MATE_BOUND:
+                self.stop_event.set()
+
+        self.stop_event.set()
+        for process in processes:
+            process.join()
+        self.stop_event = None
+        return best
+
+
+def benchmark(board: CheckerBoard, depth: int = 5, max_workers: int = 4,
+              hash_size: float = 16) -> List[Tuple[int, float, float]]:
+    """
+    Measures the time to reach a fixed depth with 1, 2, 4, ... workers, each run with an empty table
+
+    :param board: board to search
+    :param depth: depth to reach
+    :param max_workers: largest number of workers
+    :param hash_size: size of the shared transposition table in MB
+    :return: number of workers, duration and speedup compared to a single worker
+    """
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    out = list()
+    for workers in counts:
+        search = ParallelSearch(board, workers, hash_size)
+        start = time.time()
+        result = search.search(SearchLimits(depth))
+        duration = time.time() - start
+        search.close()
+        speedup = out[0][1] / duration if out else 1.
+        out.append((workers, duration, speedup))
+        nodes = result.nodes if result else 0
+        print(f'{workers} workers: depth {depth} in {duration:.2f}s, {nodes} nodes, speedup {speedup:.2f}x')
+    return out
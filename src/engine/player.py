@@ -0,0 +1,117 @@
+import time
+from typing import Optional
+
+from src.engine.search import Searcher, SearchInfo
+from src.engine.timing import TimeControl
+from src.move import Move
+
+
+class EnginePlayer:
+    """
+    Computer opponent playing one color of a `Game`.
+
+    Every move is searched within the budget of its `TimeControl`, the deadline is checked every
+    `check_interval` nodes and the best move of the last completed iteration is played.
+
+    :param is_white: color the engine plays
+    :param time_control: budget per move or clock, one second per move by default
+    :param depth: optional depth limit, e.g. for weaker opponents
+    :param check_interval: nodes between two deadline checks
+    :param ponder: search the expected reply on the opponent's time
+    """
+
+    def __init__(self, is_white: bool = False, time_control: Optional[TimeControl] = None,
+                 depth: Optional[int] = None, check_interval: int = 256, ponder: bool = False) -> None:
+        self.is_white = is_white
+        self.time_control = time_control or TimeControl(move_time=1.)
+        self.depth = depth
+        self.check_interval = check_interval
+        self.ponder = ponder
+        self.ponder_search: Optional['Analysis'] = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.last_info: Optional[SearchInfo] = None
+
+    def think(self, game: 'Game') -> Optional[Move]:
+        """
+        Searches the best move of the current position and updates the clock
+
+        :param game: game to search, its board is restored afterwards
+        :return: best move, None without legal moves
+        """
+        start = time.time()
+        pondered = self.stop_pondering(game.board.hash)
+        if pondered is not None and self.last_info is not None and pondered.depth >= self.last_info.depth:
+            # the opponent's time was enough to search as deep as a regular move
+            self.last_info = pondered
+        else:
+            table = self.ponder_search.table if self.ponder_search else game.transposition_table
+            searcher = Searcher(game.board, table, check_interval=self.check_interval)
+            start_depth = pondered.depth + 1 if pondered is not None else 1
+            self.last_info = searcher.search(self.time_control.limits(self.depth), start_depth) or pondered
+        move = self.last_info.best_move if self.last_info else None
+        if move is None:
+            # not even the first iteration completed, any legal move beats losing on time
+            moves = game.board.legal_moves()
+            move = moves[0] if moves else None
+        self.time_control.spend(time.time() - start)
+        return move
+
+    def play(self, game: 'Game') -> bool:
+        """
+        Searches and plays a move if it is the engine's turn
+
+        :param game: running game
+        :return: a move was played
+        """
+        if not game.running or game.is_white_turn != self.is_white or game.backend.needs_render_selector:
+            return False
+        move = self.think(game)
+        if move is None:
+            return False
+        game.board.perform_move(move)
+        if self.ponder and game.running:
+            self.start_pondering(game)
+        return True
+
+    def start_pondering(self, game: 'Game') -> None:
+        """
+        Searches the position after the expected reply, the second move of the principal variation,
+        in a background process until the opponent moved
+        """
+        if self.last_info is None or len(self.last_info.pv) < 2:
+            return
+        if self.ponder_search is None:
+            from src.engine.analysis import Analysis
+
+            self.ponder_search = Analysis(game.hash_size)
+        board = game.board
+        undo = board.make_move(self.last_info.pv[1])
+        self.ponder_search.start(board)
+        board.unmake_move(undo)
+
+    def stop_pondering(self, key: int) -> Optional[SearchInfo]:
+        """
+        Stops pondering once the opponent moved
+
+        :param key: hash of the position after the opponent's move
+        :return: deepest pondered iteration if the expected reply was played, None otherwise
+        """
+        if self.ponder_search is None or self.ponder_search.key is None:
+            return None
+        is_hit = self.ponder_search.key == key
+        # only a hit needs the final iteration of the worker
+        self.ponder_search.stop(wait=is_hit)
+        # a miss only wastes the background search, its table entries age out
+        pondered = self.ponder_search.latest if is_hit else None
+        self.ponder_search.key = None
+        if is_hit:
+            self.ponder_hits += 1
+        else:
+            self.ponder_misses += 1
+        return pondered
+
+    def close(self) -> None:
+        if self.ponder_search is not None:
+            self.ponder_search.close()
+            self.ponder_search = None
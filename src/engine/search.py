@@ -0,0 +1,317 @@
+import time
+from typing import Callable, List, Optional
+
+from src.board import CheckerBoard
+from src.engine.ordering import MoveOrdering
+from src.move import Move
+from src.transposition import TranspositionTable
+
+
+MATE = 100000
+INFINITY = 1000000
+MAX_PLY = 64
+# scores beyond this are mates, their distance is counted from the root
+MATE_BOUND = MATE - MAX_PLY
+
+
+class SearchLimits:
+    """
+    Limits of a search, the search stops at whichever is reached first.
+
+    :param depth: maximum depth in plies
+    :param nodes: maximum number of visited nodes
+    :param time: maximum duration in seconds
+    """
+
+    def __init__(self, depth: int = MAX_PLY, nodes: Optional[int] = None, time: Optional[float] = None) -> None:
+        self.depth = min(depth, MAX_PLY)
+        self.nodes = nodes
+        self.time = time
+
+
+class SearchStatistics:
+    """
+    Pruning statistics of a single iteration, collected in statistics mode
+    """
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        # effective branching factor, nodes of this iteration divided by nodes of the previous one
+        self.branching_factor = 0.
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Share of beta cutoffs caused by the first searched move, close to 1 means good move ordering
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.
+
+    def __str__(self) -> str:
+        return (f'ebf {self.branching_factor:.2f} cutoffs {self.cutoffs} '
+                f'first {self.first_move_cutoff_rate * 100:.1f}% qnodes {self.quiescence_nodes}')
+
+
+class SearchInfo:
+    """
+    Result of one completed iteration of the iterative deepening
+    """
+
+    def __init__(self, depth: int, score: int, nodes: int, duration: float, pv: List[Move],
+                 statistics: Optional[SearchStatistics] = None) -> None:
+        self.depth = depth
+        self.score = score
+        self.nodes = nodes
+        self.duration = duration
+        self.pv = pv
+        self.statistics = statistics
+
+    @property
+    def best_move(self) -> Optional[Move]:
+        return self.pv[0] if self.pv else None
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / max(self.duration, 1e-9))
+
+    @property
+    def mate_in(self) -> Optional[int]:
+        """
+        Moves until mate, negative if the player to move gets mated, None for regular scores
+        """
+        if abs(self.score) < MATE_BOUND:
+            return None
+        plies = MATE - abs(self.score)
+        return (plies + 1) // 2 if self.score > 0 else -(plies // 2)
+
+    def __str__(self) -> str:
+        score = f'cp {self.score}' if self.mate_in is None else f'mate {self.mate_in}'
+        pv = ' '.join(move.to_string() for move in self.pv)
+        statistics = f' {self.statistics}' if self.statistics else ''
+        return (f'depth {self.depth} score {score} nodes {self.nodes} nps {self.nps} '
+                f'time {int(self.duration * 1000)}{statistics} pv {pv}')
+
+
+class Searcher:
+    """
+    Negamax alpha-beta search with iterative deepening and quiescence search on a `CheckerBoard`.
+
+    The board is searched in place using `make_move`/`unmake_move` and restored afterwards.
+    Scores are centipawns from the view of the player to move, see `CheckerBoard.evaluate`.
+
+    :param board: board to search
+    :param table: optional transposition table, shared between searches
+    :param on_iteration: called with the `SearchInfo` of every completed iteration
+    :param ordering: sort moves of the main search by `MoveOrdering`, disable to measure its gain,
+        captures of the quiescence search are always sorted by MVV-LVA
+    :param statistics: collect `SearchStatistics` for every iteration
+    :param check_interval: nodes searched between two checks of the limits, lower values keep the deadline
+        tighter at the cost of more clock reads
+    """
+    # how many nodes are searched between two limit checks
+    CHECK_INTERVAL = 1024
+    # a new iteration is only started if this share of the time limit is left,
+    # it would most likely not complete anyway
+    ITERATION_TIME_SHARE = .5
+
+    def __init__(self, board: CheckerBoard, table: Optional[TranspositionTable] = None,
+                 on_iteration: Optional[Callable[[SearchInfo], None]] = None, ordering: bool = True,
+                 statistics: bool = False, check_interval: Optional[int] = None) -> None:
+        self.board = board
+        if check_interval is not None:
+            self.CHECK_INTERVAL = check_interval
+        self.table = table
+        self.on_iteration = on_iteration
+        self.ordering = MoveOrdering(MAX_PLY)
+        self.use_ordering = ordering
+        self.statistics: Optional[SearchStatistics] = SearchStatistics() if statistics else None
+        self.limits = SearchLimits()
+        self.nodes = 0
+        self.start_time = 0.
+        self.stopped = False
+        # triangular principal variation table, `pv[ply]` holds the line starting at `ply`
+        self.pv: List[List[Move]] = [list() for _ in range(MAX_PLY + 1)]
+
+    def stop(self) -> None:
+        """
+        Requests the running search to stop, may be called from another thread
+        """
+        self.stopped = True
+
+    def search(self, limits: Optional[SearchLimits] = None, start_depth: int = 1) -> Optional[SearchInfo]:
+        """
+        Runs iterative deepening until a limit is reached
+
+        :param limits: search limits, unlimited depth up to `MAX_PLY` by default
+        :param start_depth: depth of the first iteration, helper threads of a parallel search skip depths
+        :return: info of the deepest completed iteration, None if not even the first iteration completed
+        """
+        self.limits = limits or SearchLimits()
+        self.nodes = 0
+        self.stopped = False
+        self.start_time = time.time()
+        if self.table is not None:
+            self.table.new_search()
+        self.ordering.clear()
+
+        result = None
+        previous_nodes = 0
+        for depth in range(min(start_depth, self.limits.depth), self.limits.depth + 1):
+            nodes = self.nodes
+            statistics = self.statistics = SearchStatistics() if self.statistics is not None else None
+            score = self.negamax(depth, -INFINITY, INFINITY, 0)
+            if self.stopped:
+                break
+            if statistics is not None:
+                statistics.nodes = self.nodes - nodes
+                statistics.branching_factor = statistics.nodes / previous_nodes if previous_nodes else 0.
+                previous_nodes = statistics.nodes
+            self.ordering.age()
+            result = SearchInfo(depth, score, self.nodes, time.time() - self.start_time, list(self.pv[0]),
+                                statistics)
+            if self.on_iteration:
+                self.on_iteration(result)
+            if not result.pv or abs(score) >= MATE_BOUND:
+                # no legal move or forced mate found
+                break
+            if self.limits.time is not None and result.duration > self.limits.time * self.ITERATION_TIME_SHARE:
+                break
+        return result
+
+    def check_limits(self) -> None:
+        limits = self.limits
+        if limits.nodes is not None and self.nodes >= limits.nodes:
+            self.stopped = True
+        elif limits.time is not None and time.time() - self.start_time >= limits.time:
+            self.stopped = True
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Fail-hard alpha-beta search
+
+        :param depth: remaining depth in plies
+        :param alpha: lower bound of the window
+        :param beta: upper bound of the window
+        :param ply: distance to the root
+        :return: score of the position for the player to move
+        """
+        board = self.board
+        self.pv[ply] = list()
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes % self.CHECK_INTERVAL == 0:
+            self.check_limits()
+        if self.stopped:
+            return 0
+
+        table = self.table
+        entry = table.probe(board.hash) if table is not None else None
+        if entry is not None and entry[0] >= depth and ply > 0:
+            entry_score = self.score_from_table(entry[2], ply)
+            bound = entry[1]
+            if (bound == TranspositionTable.EXACT
+                    or (bound == TranspositionTable.LOWER and entry_score >= beta)
+                    or (bound == TranspositionTable.UPPER and entry_score <= alpha)):
+                return entry_score
+
+        moves = board.legal_moves()
+        if not moves:
+            return -MATE + ply if board.is_check() else 0
+        if self.use_ordering:
+            self.ordering.order(board, moves, ply, entry[3] if entry is not None else 0)
+
+        original_alpha = alpha
+        best_move = None
+        for index, move in enumerate(moves):
+            is_quiet = not move.promotion and not board.is_capture(move)
+            undo = board.make_move(move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move(undo)
+            if self.stopped:
+                return 0
+            if score >= beta:
+                if self.statistics is not None:
+                    self.statistics.cutoffs += 1
+                    self.statistics.first_move_cutoffs += index == 0
+                if self.use_ordering and is_quiet:
+                    self.ordering.update(move, depth, ply)
+                if table is not None:
+                    table.store(board.hash, depth, TranspositionTable.LOWER, self.score_to_table(beta, ply),
+                                move.encode())
+                return beta
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self.pv[ply] = [move] + self.pv[ply + 1]
+
+        if table is not None:
+            bound = TranspositionTable.EXACT if alpha > original_alpha else TranspositionTable.UPPER
+            table.store(board.hash, depth, bound, self.score_to_table(alpha, ply),
+                        best_move.encode() if best_move else 0)
+        return alpha
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        Searches captures and promotions only until the position is quiet,
+        so the evaluation is never taken in the middle of an exchange
+
+        :param alpha: lower bound of the window
+        :param beta: upper bound of the window
+        :param ply: distance to the root
+        :return: score of the position for the player to move
+        """
+        board = self.board
+        self.nodes += 1
+        if self.nodes % self.CHECK_INTERVAL == 0:
+            self.check_limits()
+        if self.statistics is not None:
+            self.statistics.quiescence_nodes += 1
+        if self.stopped:
+            return 0
+
+        # "stand pat", the player to move may decline all captures
+        score = board.evaluate()
+        if score >= beta:
+            return beta
+        if ply >= MAX_PLY:
+            return score
+        alpha = max(alpha, score)
+
+        moves = board.legal_moves(captures_only=True)
+        moves.sort(key=lambda capture: MoveOrdering.capture_score(board, capture), reverse=True)
+        for index, move in enumerate(moves):
+            undo = board.make_move(move)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            board.unmake_move(undo)
+            if self.stopped:
+                return 0
+            if score >= beta:
+                if self.statistics is not None:
+                    self.statistics.cutoffs += 1
+                    self.statistics.first_move_cutoffs += index == 0
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    @staticmethod
+    def score_to_table(score: int, ply: int) -> int:
+        """
+        Stores mate scores relative to the node instead of the root
+        """
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def score_from_table(score: int, ply: int) -> int:
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
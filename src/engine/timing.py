@@ -0,0 +1,58 @@
+from typing import Optional
+
+from src.engine.search import SearchLimits
+
+
+class TimeControl:
+    """
+    Time budget of the engine, either a fixed duration per move or a clock with increment.
+
+    :param move_time: fixed budget per move in seconds, takes precedence over the clock
+    :param remaining: time left on the clock in seconds
+    :param increment: time added to the clock after every move in seconds
+    :param moves_to_go: moves until the next time control, the budget is spread over them
+    """
+    # moves the remaining time is spread over when no time control is announced
+    DEFAULT_MOVES_TO_GO = 30
+    # kept on the clock for the overhead around the search
+    SAFETY_MARGIN = 0.05
+    MIN_BUDGET = 0.01
+
+    def __init__(self, move_time: Optional[float] = None, remaining: Optional[float] = None,
+                 increment: float = 0., moves_to_go: Optional[int] = None) -> None:
+        self.move_time = move_time
+        self.remaining = remaining
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+
+    def budget(self) -> Optional[float]:
+        """
+        :return: seconds to spend on the next move, None if the time is unlimited
+        """
+        if self.move_time is not None:
+            return self.move_time
+        if self.remaining is None:
+            return None
+        moves_to_go = self.moves_to_go or self.DEFAULT_MOVES_TO_GO
+        budget = self.remaining / moves_to_go + self.increment * 0.75
+        return max(self.MIN_BUDGET, min(budget, self.remaining - self.SAFETY_MARGIN))
+
+    def limits(self, depth: Optional[int] = None) -> SearchLimits:
+        """
+        Search limits of the next move
+
+        :param depth: optional depth limit
+        """
+        if depth is None:
+            return SearchLimits(time=self.budget())
+        return SearchLimits(depth, time=self.budget())
+
+    def spend(self, duration: float) -> None:
+        """
+        Updates the clock after a move took `duration` seconds
+        """
+        if self.remaining is None:
+            return
+        self.remaining = self.remaining - duration + self.increment
+        if self.moves_to_go:
+            self.moves_to_go -= 1
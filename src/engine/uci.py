@@ -0,0 +1,266 @@
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+from src.engine.search import Searcher, SearchInfo, SearchLimits, MAX_PLY
+from src.engine.timing import TimeControl
+from src.move import Move
+from src.position import Position
+
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+# `go` parameters followed by a number
+GO_VALUES = ('wtime', 'btime', 'winc', 'binc', 'movestogo', 'depth', 'nodes', 'movetime')
+
+
+class UciEngine:
+    """
+    Universal Chess Interface front end, see https://www.chessprogramming.org/UCI
+
+    Commands are read line by line from `input_stream`, a `go` search runs in a separate thread so
+    `stop`, `isready` and `quit` are answered while searching. Commands changing the position wait
+    for the running search instead of aborting it, so piped command files search every `go` in full.
+
+    :param game: headless game whose board is searched
+    :param input_stream: commands, stdin by default
+    :param output_stream: responses, stdout by default
+    """
+    NAME = 'chess'
+    AUTHOR = 'chess contributors'
+
+    def __init__(self, game: 'Game', input_stream: Optional[TextIO] = None,
+                 output_stream: Optional[TextIO] = None) -> None:
+        self.game = game
+        self.input = input_stream or sys.stdin
+        self.output = output_stream or sys.stdout
+        self.searcher: Optional[Searcher] = None
+        self.thread: Optional[threading.Thread] = None
+        # `go infinite` and `go ponder` hold their `bestmove` until `stop` or `ponderhit`
+        self.infinite = False
+        self.released = threading.Event()
+        # limits a pondering search continues with after `ponderhit`
+        self.ponder_limits: Optional[SearchLimits] = None
+        self.lock = threading.Lock()
+
+    @property
+    def board(self) -> 'CheckerBoard':
+        return self.game.board
+
+    def send(self, line: str) -> None:
+        with self.lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self) -> None:
+        """
+        Answers commands until `quit` or the end of the input
+        """
+        for line in self.input:
+            if not self.handle(line):
+                self.stop()
+                return
+        # end of a piped command file, an infinite search would never end
+        if self.infinite:
+            self.stop()
+        self.wait()
+
+    def handle(self, line: str) -> bool:
+        """
+        Processes a single command, unknown commands are ignored as the protocol demands
+
+        :return: False once the engine should quit
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == 'quit':
+            return False
+        if command == 'uci':
+            self.send(f'id name {self.NAME}')
+            self.send(f'id author {self.AUTHOR}')
+            self.send(f'option name Hash type spin default {int(self.game.hash_size)} min 1 max 1024')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self.set_option(arguments)
+        elif command == 'ucinewgame':
+            self.wait()
+            self.game.transposition_table.clear()
+        elif command == 'position':
+            self.wait()
+            self.set_position(arguments)
+        elif command == 'go':
+            self.wait()
+            self.go(arguments)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'ponderhit':
+            self.ponderhit()
+        return True
+
+    def set_option(self, arguments: List[str]) -> None:
+        if 'name' not in arguments or 'value' not in arguments:
+            return
+        name = ' '.join(arguments[arguments.index('name') + 1:arguments.index('value')])
+        value = ' '.join(arguments[arguments.index('value') + 1:])
+        if name.lower() == 'hash':
+            try:
+                hash_size = float(value)
+            except ValueError:
+                hash_size = 0
+            if not 1 <= hash_size <= 1024:
+                self.send(f'info string invalid Hash value {value}')
+                return
+            self.wait()
+            # the table is reallocated on its next use
+            self.game.hash_size = hash_size
+
+    def set_position(self, arguments: List[str]) -> None:
+        """
+        Handles `position [startpos | fen <fen>] [moves <move> ...]`, an invalid FEN or a malformed or illegal move
+        leaves the position unchanged
+        """
+        moves_index = arguments.index('moves') if 'moves' in arguments else len(arguments)
+        moves = list()
+        for text in arguments[moves_index + 1:]:
+            try:
+                move = Move.from_string(text)
+            except (KeyError, IndexError, ValueError):
+                move = None
+            if move is None or move.to_string() != text.lower():
+                self.send(f'info string malformed move {text}')
+                return
+            moves.append(move)
+
+        fen = START_FEN
+        if arguments and arguments[0] == 'fen':
+            fen = ' '.join(arguments[1:moves_index])
+            if not self.is_valid_fen(fen):
+                self.send(f'info string invalid fen {fen}')
+                return
+
+        snapshot = self.board.snapshot()
+        self.board.reset(fen)
+        for text, move in zip(arguments[moves_index + 1:], moves):
+            if move not in self.board.legal_moves():
+                self.send(f'info string illegal move {text}')
+                self.board.restore(snapshot)
+                return
+            self.board.make_move(move)
+
+    @staticmethod
+    def is_valid_fen(fen: str) -> bool:
+        """
+        Checks a FEN for 8 ranks of 8 tiles, known pieces, side to move and en-passant square
+        """
+        try:
+            Position.from_fen(fen)
+        except (KeyError, IndexError, ValueError):
+            return False
+        parts = fen.split()
+        ranks = parts[0].split('/')
+        if len(ranks) != 8 or any(sum(int(char) if char.isdigit() else 1 for char in rank) != 8 for rank in ranks):
+            return False
+        if len(parts) > 1 and parts[1] not in ('w', 'b'):
+            return False
+        return len(parts) < 4 or parts[3] == '-' or (
+            len(parts[3]) == 2 and parts[3][0] in 'abcdefgh' and parts[3][1] in '36')
+
+    def parse_go(self, arguments: List[str]) -> Dict[str, int]:
+        """
+        Collects the numeric `go` parameters, invalid values are reported and skipped
+        """
+        values = dict()
+        for index, token in enumerate(arguments[:-1]):
+            if token in GO_VALUES:
+                try:
+                    values[token] = int(arguments[index + 1])
+                except ValueError:
+                    self.send(f'info string invalid go value {token} {arguments[index + 1]}')
+        return values
+
+    def limits(self, arguments: List[str]) -> SearchLimits:
+        """
+        Translates `go` parameters into search limits, the clock of the side to move sets the time budget
+        """
+        values = self.parse_go(arguments)
+        depth = values.get('depth', MAX_PLY)
+        nodes = values.get('nodes')
+        if 'infinite' in arguments:
+            return SearchLimits(depth, nodes)
+        side = 'w' if self.board.is_white_turn else 'b'
+        time_control = TimeControl(
+            move_time=values['movetime'] / 1000 if 'movetime' in values else None,
+            remaining=values[f'{side}time'] / 1000 if f'{side}time' in values else None,
+            increment=values.get(f'{side}inc', 0) / 1000,
+            moves_to_go=values.get('movestogo'))
+        return SearchLimits(depth, nodes, time_control.budget())
+
+    def go(self, arguments: List[str]) -> None:
+        limits = self.limits(arguments)
+        self.infinite = 'infinite' in arguments or 'ponder' in arguments
+        self.released.clear()
+        self.ponder_limits = None
+        if 'ponder' in arguments:
+            # the opponent's move is not played yet, search until `ponderhit` applies the time budget
+            self.ponder_limits = limits
+            limits = SearchLimits(limits.depth, limits.nodes)
+        self.searcher = Searcher(self.board, self.game.transposition_table,
+                                 on_iteration=lambda info: self.send(f'info {info}'))
+        self.thread = threading.Thread(target=self.search, args=(self.searcher, limits), daemon=True)
+        self.thread.start()
+
+    def search(self, searcher: Searcher, limits: SearchLimits) -> None:
+        result: Optional[SearchInfo] = searcher.search(limits)
+        if self.infinite:
+            # a forced mate ends the search early, the protocol still demands waiting for `stop`
+            self.released.wait()
+        if result is None or result.best_move is None:
+            # stopped before the first iteration completed
+            moves = self.board.legal_moves()
+            self.send(f'bestmove {moves[0] if moves else "0000"}')
+        elif len(result.pv) > 1:
+            self.send(f'bestmove {result.best_move} ponder {result.pv[1]}')
+        else:
+            self.send(f'bestmove {result.best_move}')
+
+    def wait(self) -> None:
+        """
+        Waits until the running search sent its `bestmove`
+        """
+        if self.thread is None:
+            return
+        self.thread.join()
+        self.thread = None
+        self.searcher = None
+
+    def ponderhit(self) -> None:
+        """
+        The expected move was played, the pondering search continues as a regular one
+        """
+        if self.thread is None or self.ponder_limits is None:
+            return
+        limits, self.ponder_limits = self.ponder_limits, None
+        if limits.time is not None:
+            # the budget counts from now, the time spent pondering was the opponent's
+            self.searcher.limits = SearchLimits(limits.depth, limits.nodes,
+                                                time.time() - self.searcher.start_time + limits.time)
+        self.infinite = False
+        self.released.set()
+
+    def stop(self) -> None:
+        """
+        Stops a running search and waits for its `bestmove`
+        """
+        if self.thread is None:
+            return
+        self.released.set()
+        while self.thread.is_alive():
+            # repeated, the thread might not have entered the search yet
+            self.searcher.stop()
+            self.thread.join(0.01)
+        self.wait()
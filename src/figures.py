@@ -1,7 +1,9 @@
-from typing import List, Optional
+import copy
+from typing import FrozenSet, Iterable, List, Optional, Tuple
 
 from src.helpers import sign, Coords
-from src.movable import Movable
+from src.movable import (Movable, DIAGONAL_DIRECTIONS, KING_MOVES, KING_TARGETS, KNIGHT_MOVES, KNIGHT_TARGETS,
+                         LINE_DIRECTIONS)
 
 
 """
@@ -54,28 +56,52 @@ class Figure(Movable):
         self.en_passant = False
         self.checked_en_passant = False
         self.castles_with: Optional[Figure] = None
+        # cached `move_hints` and the board hash and tile they belong to
+        self.hints: FrozenSet[int] = frozenset()
+        self.hints_key: Optional[Tuple[int, int]] = None
         super().__init__(pos, _board)
 
+    def copy(self, board: 'CheckerBoard') -> 'Figure':
+        """
+        Creates an independent copy of the figure placed on another board
+
+        :param board: board the copy belongs to
+        """
+        figure = copy.copy(self)
+        figure.board = board
+        figure.castles_with = None
+        return figure
+
     def checkmate(self) -> bool:
         """
         Method to signalize checkmate, this is actually only implemented in King
         """
         return False
 
-    def draw_allowed_moves(self, canvas: 'pygame.Surface') -> None:
+    def move_hints(self) -> FrozenSet[int]:
+        """
+        Legal target tiles of the figure, highlighted while it is selected.
+
+        Computed once per position of the board, a figure held selected costs no move generation.
+        """
+        key = (self.board.hash, self.square)
+        if self.hints_key != key:
+            square = self.square
+            self.hints = frozenset(move.end for move in self.board.legal_moves() if move.start == square)
+            self.hints_key = key
+        return self.hints
+
+    def draw_allowed_moves(self, canvas: 'pygame.Surface', squares: Optional[Iterable[int]] = None) -> None:
         """
         Helper method to render allowed moves of a figure onto a canvas
 
         :param canvas: canvas to draw to
+        :param squares: only highlight these tiles, all `move_hints` by default
         """
-        import pygame
-        square_size = self.board.cell_size
-        mask = pygame.Surface(canvas.get_size(), pygame.SRCALPHA)
-        for move in self.remove_set(self.allowed_moves):
-            pos = (move.x * square_size[0], move.y * square_size[1], square_size[0], square_size[1])
-            pygame.draw.rect(mask, (0, 0, 0, 100), pos)
-
-        canvas.blit(mask, mask.get_rect())
+        board = self.board
+        for square in self.move_hints() if squares is None else squares:
+            rect = board.tile_rect(square)
+            canvas.blit(board.hint_overlay, rect, ((0, 0), rect.size))
 
 
 class Pawn(Figure):
@@ -116,17 +142,47 @@ class Pawn(Figure):
 
         moves += list(
             [Coords(self.position.x, self.position.y + self.direction)]
-            + ([Coords(self.position.x, self.position.y + (2 * self.direction))] if not self.has_moved else [])
+            + ([Coords(self.position.x, self.position.y + (2 * self.direction))] if self.on_initial_row else [])
         )
         return moves
 
+    @property
+    def on_initial_row(self) -> bool:
+        return self.square >> 3 == (6 if self.is_white else 1)
+
+    def targets(self) -> List[int]:
+        fields = self.board.fields
+        x, y = self.square & 7, self.square >> 3
+        row = y + self.direction
+        if not 0 <= row < 8:
+            return []
+        ahead = self.square + 8 * self.direction
+        targets = list()
+        if fields[row][x] is None:
+            targets.append(ahead)
+            if self.on_initial_row and fields[row + self.direction][x] is None:
+                targets.append(ahead + 8 * self.direction)
+        for dx in (-1, 1):
+            if not 0 <= x + dx < 8:
+                continue
+            cell = fields[row][x + dx]
+            if cell is None:
+                # en-passant, the passed pawn is next to this one
+                cell = fields[y][x + dx]
+                if cell is None or not cell.en_passant:
+                    continue
+            if cell.is_white != self.is_white:
+                targets.append(ahead + dx)
+        return targets
+
     def remove_set(self, coords):
-        new_coords = super().remove_set(coords)
+        fields = self.board.fields
         out = list()
-        for coord in new_coords:
-            if coord in [Coords(self.position.y + self.direction, self.position.x),
-                         Coords(self.position.y + 2 * self.direction, self.position.x)] \
-                    and self.check_field(coord) is not None:
+        for coord in super().remove_set(coords):
+            # straight moves can neither capture nor pass a figure
+            if coord.x == self.position.x and (
+                    fields[coord.y][coord.x] is not None
+                    or fields[self.position.y + self.direction][coord.x] is not None):
                 continue
             out.append(coord)
 
@@ -178,11 +234,13 @@ class Pawn(Figure):
 
         if allowed and ((self.is_white and new_pos.y == 0) or (not self.is_white and new_pos.y == 7)):
             # we're on the other side
-            self.board.game.backend.needs_render_selector = True
+            self.board.request_promotion()
         return allowed
 
 
 class Queen(Figure):
+    ray_moves = True
+
     def __init__(self, pos: Coords, **kwargs):
         super().__init__(pos, **kwargs)
         self.value = 9 if self.is_white else -9
@@ -190,13 +248,18 @@ class Queen(Figure):
 
     @property
     def allowed_moves(self) -> List[Coords]:
-        return self.get_diagonals(self.position, 8) + self.get_lines(self.position, 8)
+        return self.get_ray_moves(LINE_DIRECTIONS + DIAGONAL_DIRECTIONS)
+
+    def targets(self) -> List[int]:
+        return self.get_ray_targets(LINE_DIRECTIONS + DIAGONAL_DIRECTIONS)
 
     def __str__(self) -> str:
         return f'{"white " if self.is_white else "black "}Queen: {self.position}'
 
 
 class King(Figure):
+    ray_moves = True
+
     def __init__(self, pos: Coords, **kwargs):
         super().__init__(pos, **kwargs)
         self.value = 100 if self.is_white else -100
@@ -206,7 +269,10 @@ class King(Figure):
     @property
     def allowed_moves(self) -> List[Coords]:
         castle_positions = self.get_castles() if self.can_castle else []
-        return castle_positions + self.get_diagonals(self.position, 1) + self.get_lines(self.position, 1)
+        return castle_positions + KING_MOVES[self.square]
+
+    def targets(self) -> List[int]:
+        return self.get_jump_targets(KING_TARGETS)
 
     def get_castles(self) -> List[Coords]:
         rooks = self.board.get_figures(FieldType.ROOK | (FieldType.WHITE if self.is_white else FieldType.BLACK))
@@ -244,6 +310,8 @@ class King(Figure):
 
 
 class Rook(Figure):
+    ray_moves = True
+
     def __init__(self, pos: Coords, **kwargs) -> None:
         super().__init__(pos, **kwargs)
         self.value = 5 if self.is_white else -5
@@ -251,13 +319,18 @@ class Rook(Figure):
 
     @property
     def allowed_moves(self) -> List[Coords]:
-        return self.get_lines(self.position, 8)
+        return self.get_ray_moves(LINE_DIRECTIONS)
+
+    def targets(self) -> List[int]:
+        return self.get_ray_targets(LINE_DIRECTIONS)
 
     def __str__(self) -> str:
         return f'{"white " if self.is_white else "black "}Rook: {self.position}'
 
 
 class Bishop(Figure):
+    ray_moves = True
+
     def __init__(self, pos, **kwargs):
         super().__init__(pos, **kwargs)
         self.value = 3 if self.is_white else -3
@@ -265,7 +338,10 @@ class Bishop(Figure):
 
     @property
     def allowed_moves(self) -> List[Coords]:
-        return self.get_diagonals(self.position, 8)
+        return self.get_ray_moves(DIAGONAL_DIRECTIONS)
+
+    def targets(self) -> List[int]:
+        return self.get_ray_targets(DIAGONAL_DIRECTIONS)
 
     def __str__(self):
         return f'{"white " if self.is_white else "black "}Bishop: {self.position}'
@@ -280,7 +356,20 @@ class Knight(Figure):
 
     @property
     def allowed_moves(self) -> List[Coords]:
-        return self.clean_target_fields(self.get_night_moves(self.position))
+        return list(KNIGHT_MOVES[self.square])
+
+    def targets(self) -> List[int]:
+        return self.get_jump_targets(KNIGHT_TARGETS)
 
     def __str__(self) -> str:
         return f'{"white " if self.is_white else "black "}Knight: {self.position}'
+
+
+FIGURE_CLASSES = {
+    FieldType.PAWN: Pawn,
+    FieldType.KNIGHT: Knight,
+    FieldType.BISHOP: Bishop,
+    FieldType.ROOK: Rook,
+    FieldType.QUEEN: Queen,
+    FieldType.KING: King,
+}
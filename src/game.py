@@ -1,8 +1,9 @@
 import time
-from copy import deepcopy
-from typing import Optional
+from typing import Optional, Type
 
 from src.board import CheckerBoard
+from src.figures import FieldType
+from src.move import Move, MoveResult
 
 from src.history import TurnHistory, GameHistory
 
@@ -11,48 +12,87 @@ class Game:
     # TODO:
     #      - Integrate `ml/main`
     #      - implement interface as painted...
-    history = TurnHistory()
-    game_history = GameHistory()
 
-    is_mouse_clicked = False
-    running = True
-    is_white_turn = True
-
-    def __init__(self, use_pygame: bool = True, underpromoted_castling: bool = False, frame_rate: float = 0.05, skip_init: bool = False) -> None:
+    def __init__(self, use_pygame: bool = True, underpromoted_castling: bool = False, frame_rate: float = 0.05,
+                 skip_init: bool = False, hash_size: float = 16, engine: Optional['EnginePlayer'] = None,
+                 analysis: Optional['Analysis'] = None, game_history: Optional[GameHistory] = None,
+                 backend: Optional[Type['BaseBackend']] = None) -> None:
         """
         Main Game class maintains and holds state of chess game.
 
         :param use_pygame: indicates to use pygame backend, if false headless console backend is used
         :param underpromoted_castling:
         :param frame_rate: 0.05 for 120FPS, 0.1 for 60 FPS, 0.2 for 30 FPS
+        :param hash_size: size of the transposition table in MB, allocated on first use
+        :param engine: computer opponent moving whenever it is its turn
+        :param analysis: background analysis following the current position
+        :param game_history: statistics over all games, pass one instance to share it between games,
+            a game reads and writes its own otherwise
+        :param backend: backend class overriding `use_pygame`, e.g. `NullBackend` for batch work
         """
+        # all state is per game, games in one process do not interfere
+        self.history = TurnHistory()
+        self.game_history = game_history if game_history is not None else GameHistory()
+        self.running = True
+        self.hash_size = hash_size
+        self._transposition_table = None
+        self.engine = engine
+        self.analysis = analysis
         if skip_init:
             return
-        self.use_pygame = use_pygame
         self.frame_rate = frame_rate
-        if self.use_pygame:
+        if backend is not None:
+            self.backend = backend(self)
+        elif use_pygame:
             from src.backends.pygame_backend import PygameBackend
             self.backend = PygameBackend(self)
         else:
             from src.backends.base import HeadlessBackend
             self.backend = HeadlessBackend(self)
+        self.use_pygame = self.backend.uses_pygame
 
-        self.board = CheckerBoard(self.backend.canvas, self)
         self.underpromoted_castling = underpromoted_castling
+        self.board = self.create_board()
+        # start position, restored in place by `restart`
+        self.start = self.board.snapshot()
 
     def copy(self):
         game = Game(skip_init=True)
         game.use_pygame = self.use_pygame
-        game.is_white_turn = self.is_white_turn
-        game.is_mouse_clicked = self.is_mouse_clicked
         game.game_history = self.game_history
-        game.history = self.history
+        game.history = self.history.copy()
+        game.running = self.running
         game.frame_rate = self.frame_rate
         game.board = self.board.copy()
+        game.board.game = game
+        # taken from the start position on the first `restart`
+        game.start = None
         game.backend = self.backend
         game.underpromoted_castling = self.underpromoted_castling
+        game.hash_size = self.hash_size
+        game.engine = self.engine
+        game.analysis = self.analysis
         return game
 
+    def create_board(self) -> CheckerBoard:
+        return CheckerBoard(self.backend.canvas, self, underpromoted_castling=self.underpromoted_castling,
+                            choose_promotion=self.backend.request_promotion)
+
+    @property
+    def is_white_turn(self) -> bool:
+        return self.board.is_white_turn
+
+    @is_white_turn.setter
+    def is_white_turn(self, value: bool) -> None:
+        self.board.set_turn(value)
+
+    @property
+    def transposition_table(self) -> 'TranspositionTable':
+        if self._transposition_table is None or self._transposition_table.size_mb != self.hash_size:
+            from src.transposition import TranspositionTable
+            self._transposition_table = TranspositionTable(self.hash_size)
+        return self._transposition_table
+
     @property
     def figure_selector(self) -> Optional['FigureSelector']:
         return self.backend.figure_selector
@@ -66,7 +106,12 @@ class Game:
         while self.running:
             if (time.time() - start) < self.frame_rate:
                 continue
+            if self.analysis is not None:
+                self.analysis.follow(self.board)
             self.backend.render()
+            if self.engine is not None and self.engine.play(self):
+                # blocked the loop for at most the engine's time budget, show the move first
+                continue
             self.backend.handle_game_events([])
 
             counter += 1
@@ -89,23 +134,65 @@ class Game:
         if rows < 0 or rows > 7 or cols < 0 or cols > 7:
             return
 
-        if self.board.handle_mouse_click(cols, rows, self.is_white_turn) and not self.backend.needs_render_selector:
-            # switch turn
-            self.is_white_turn = not self.is_white_turn
+        # the board passes the turn once a move was performed
+        self.board.handle_mouse_click(cols, rows, self.is_white_turn)
+
+    def play(self, move: Move) -> MoveResult:
+        """
+        Plays a move of the player to move without going through the selection state of the board.
+
+        :param move: move to play, promotions need the piece in `move.promotion`
+        :return: result, falsy if the move is illegal or the game is over
+        """
+        board = self.board
+        if not self.running or move not in board.legal_moves():
+            return MoveResult(move)
+        undo = board.perform_move(move)
+        return MoveResult(move, undo, board.is_check(), not self.running)
+
+    def play_uci(self, text: str, promotion: int = FieldType.EMPTY) -> MoveResult:
+        """
+        Plays a move given in long algebraic notation, e.g. 'e2e4', 'e1g1' or 'e7e8q'
+
+        :param text: move to play
+        :param promotion: `FieldType` to promote to, with or without color, alternatively to a fifth character of `text`
+        :return: result, falsy if the move is malformed, illegal or the game is over
+        """
+        try:
+            move = Move.from_string(text)
+        except (KeyError, IndexError, ValueError):
+            return MoveResult(None)
+        if promotion != FieldType.EMPTY:
+            move.promotion = promotion & 7
+        return self.play(move)
 
     def reset(self, with_history: bool = False) -> None:
         """
         reset game state, except history
         """
         self.backend.rescale()
-        self.board = CheckerBoard(self.backend.canvas, self)
+        self.board = self.create_board()
         if with_history:
             self.history = TurnHistory()
             if hasattr(self.backend, 'turn_history_section'):
                 self.backend.turn_history_section.reset()
 
         self.running = True
-        self.is_white_turn = True
+
+    def restart(self) -> None:
+        """
+        Starts a new game on the same board, restoring the start position in place.
+
+        Unlike `reset` neither figures nor the board are created again and the backend is not touched,
+        which makes it the reset of choice for many short games, e.g. training episodes.
+        """
+        if self.start is None or self.start.board is not self.board:
+            # board was replaced since the last snapshot
+            self.board.reset()
+            self.start = self.board.snapshot()
+        self.board.restore(self.start)
+        self.history.reset()
+        self.running = True
 
     def replay(self, step_length: float = 1.) -> None:
         """
@@ -115,18 +202,8 @@ class Game:
         moves = self.history.turns
 
         for turn in moves:
-            if turn.is_promotion:
-                self.handle_mouse_click(turn.start.x, turn.start.y)
-                self.handle_mouse_click(turn.end.x, turn.end.y)
-                self.backend.needs_render_selector = False
-                self.board.fields[turn.start.y][turn.start.y] = None
-                self.board.fields[turn.end.y][turn.end.y] = turn.figure
-                self.board.fields[turn.end.y][turn.end.y].has_moved = True
-                self.board.fields[turn.end.y][turn.end.y].prev_position = turn.start
-                self.board.selected_figure = None
-            else:
-                self.handle_mouse_click(turn.start.x, turn.start.y)
-                self.handle_mouse_click(turn.end.x, turn.end.y)
+            promotion = FieldType.clear(turn.figure.type) if turn.is_promotion else FieldType.EMPTY
+            self.play(Move.from_coords(turn.start, turn.end, promotion))
             self.backend.render()
 
             self.backend.handle_game_events([], [])
@@ -135,4 +212,8 @@ class Game:
             time.sleep(step_length)
 
     def close(self):
+        if self.engine is not None:
+            self.engine.close()
+        if self.analysis is not None:
+            self.analysis.close()
         self.backend.shutdown()
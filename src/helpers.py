@@ -27,6 +27,20 @@ class Coords:
     def row(self) -> int:
         return self.y
 
+    @property
+    def index(self) -> int:
+        """
+        Integer tile index `y * 8 + x` used by the engine internals, a8 is 0 and h1 is 63
+        """
+        return self.y * 8 + self.x
+
+    @classmethod
+    def from_index(cls, index: int) -> 'Coords':
+        """
+        Shared coordinates of a tile index, do not modify the returned object
+        """
+        return COORDS[index]
+
     @property
     def len(self) -> float:
         return math.sqrt(self.x*self.x+self.y*self.y)
@@ -42,16 +56,19 @@ class Coords:
         return Coords(self.x - other.x, self.y - other.y)
 
     def __eq__(self, other) -> bool:
-        return self.len == other.len and self.x == other.x and self.y == other.y
+        return self.x == other.x and self.y == other.y
 
     def __lt__(self, other) -> bool:
         return self.len < other.len
 
     def __hash__(self) -> int:
-        return hash(repr(self))
+        return self.y * 8 + self.x
 
     def __str__(self) -> str:
         return f'({self.x}, {self.y})'
 
     def __repr__(self) -> str:
         return str(self)
+
+
+COORDS = [Coords(index % 8, index // 8) for index in range(64)]
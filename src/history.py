@@ -33,6 +33,16 @@ class TurnHistory:
         self.turns: List[Turn] = list()
         self.is_final: bool = False
 
+    def copy(self) -> 'TurnHistory':
+        history = TurnHistory()
+        history.prev_was_pawn = self.prev_was_pawn
+        history.data = self.data
+        history.last_move = self.last_move
+        history.turn = self.turn
+        history.turns = list(self.turns)
+        history.is_final = self.is_final
+        return history
+
     def reset(self):
         self.prev_was_pawn = False
         self.data: str = ''
@@ -77,7 +87,8 @@ class TurnHistory:
     def pos_to_string(move: Coords) -> str:
         return chr(move.x + 97) + str((8 - move.y))
 
-    def record(self, figure: Figure, old_pos: Coords, move: Coords, prev_fig: Figure, is_promotion: bool = False) -> None:
+    def record(self, figure: Figure, old_pos: Coords, move: Coords, prev_fig: Figure, is_promotion: bool = False,
+               is_checkmate: bool = False) -> None:
         """
         Records Figure moved from [figure.position] [x] [move]
         might check prev_fig while doing so
@@ -88,6 +99,7 @@ class TurnHistory:
         :param move:
         :param prev_fig:
         :param is_promotion:
+        :param is_checkmate: move ended the game
         :return:
         """
         if self.is_final:
@@ -96,6 +108,7 @@ class TurnHistory:
         if is_promotion:
             self.turns.append(Turn(old_pos, move, False, figure, True))
             self.prev_was_pawn = True
+            self.is_final = is_checkmate
             return
 
         is_castling: bool = figure.castles_with is not None
@@ -122,7 +135,7 @@ class TurnHistory:
 
         self.last_move += self.pos_to_string(move)
 
-        if prev_fig and prev_fig.checkmate():
+        if is_checkmate or (prev_fig and prev_fig.checkmate()):
             self.last_move += '#'
         else:
             self.last_move += ' '
@@ -133,7 +146,6 @@ class TurnHistory:
             self.data += '\n'
 
         if '#' in self.data:
-            print(self.data)
             self.is_final = True
 
     def save(self, filename):
@@ -148,15 +160,40 @@ class TurnHistory:
 
 
 class GameHistory:
-    def __init__(self):
-        self.file_name = 'history.json'
-        self.data = dict()
-        self.try_read()
+    """
+    Statistics over all games, stored in `file_name` relative to the repository root.
+
+    The file is read on first access of `data`, so creating games never touches the disk.
+    """
+
+    def __init__(self, file_name: str = 'history.json'):
+        self.file_name = file_name
+        self._data: Optional[dict] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(PATH_NAME, '../', self.file_name)
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self.try_read()
+        return self._data
+
+    @data.setter
+    def data(self, value: dict) -> None:
+        self._data = value
 
     def try_read(self):
-        with open(os.path.join(PATH_NAME, '../', self.file_name), 'r') as file:
-            self.data = json.loads(file.read())
+        try:
+            with open(self.path, 'r') as file:
+                self._data = json.loads(file.read())
+        except FileNotFoundError:
+            self._data = {'White': 0, 'Black': 0}
 
     def save(self):
-        with open(os.path.join(PATH_NAME, '../', self.file_name), 'w') as file:
-            file.write(json.dumps(self.data))
+        if self._data is None:
+            # never read, nothing changed
+            return
+        with open(self.path, 'w') as file:
+            file.write(json.dumps(self._data))
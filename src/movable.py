@@ -1,6 +1,53 @@
 from typing import Optional, List, Union
 
-from src.helpers import sign, Coords
+from src.helpers import sign, Coords, COORDS
+
+
+# (dx, dy) per direction, the first four increase the tile index `y * 8 + x`
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (-1, 1), (-1, 0), (0, -1), (-1, -1), (1, -1))
+LINE_DIRECTIONS = (0, 1, 4, 5)
+DIAGONAL_DIRECTIONS = (2, 3, 6, 7)
+KNIGHT_OFFSETS = ((1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1))
+
+
+def _build_jump_table(offsets) -> List[List[int]]:
+    """
+    Builds on-board tile indices of single jumps, indexed by `y * 8 + x` of the starting tile
+    """
+    table = list()
+    for index in range(64):
+        x, y = index % 8, index // 8
+        table.append([(y + dy) * 8 + x + dx for dx, dy in offsets if 0 <= x + dx < 8 and 0 <= y + dy < 8])
+    return table
+
+
+def _build_rays() -> List[List[List[int]]]:
+    """
+    Builds rays of tile indices indexed by `[direction][y * 8 + x]`, ordered from the starting tile outwards
+    """
+    rays = list()
+    for dx, dy in DIRECTIONS:
+        direction = list()
+        for index in range(64):
+            x, y = index % 8 + dx, index // 8 + dy
+            ray = list()
+            while 0 <= x < 8 and 0 <= y < 8:
+                ray.append(y * 8 + x)
+                x += dx
+                y += dy
+            direction.append(ray)
+        rays.append(direction)
+    return rays
+
+
+KNIGHT_TARGETS = _build_jump_table(KNIGHT_OFFSETS)
+KING_TARGETS = _build_jump_table(DIRECTIONS)
+RAY_TILES = _build_rays()
+
+# the same tables as coordinates for the UI-facing `allowed_moves`
+KNIGHT_MOVES = [[COORDS[tile] for tile in tiles] for tiles in KNIGHT_TARGETS]
+KING_MOVES = [[COORDS[tile] for tile in tiles] for tiles in KING_TARGETS]
+RAYS = [[[COORDS[tile] for tile in ray] for ray in direction] for direction in RAY_TILES]
 
 
 class DirectionMixin:
@@ -31,24 +78,12 @@ class DirectionMixin:
         :param length: length of diagonals starting at `pos`
         :return: list of diagonal tiles starting from `pos`
         """
-        x = pos.x
-        y = pos.y
-
-        res = list()
-        for _x in range(1, length + 1):
-            res.extend([Coords(x + _x, y + _x), Coords(x - _x, y - _x), Coords(x - _x, y + _x), Coords(x + _x, y - _x)])
-        return list(set(filter(lambda val: val.x >= 0 and val.y >= 0 and abs(val.x) < 8 and abs(val.y) < 8, res)))
+        index = pos.y * 8 + pos.x
+        return [field for direction in DIAGONAL_DIRECTIONS for field in RAYS[direction][index][:length]]
 
     @classmethod
     def get_night_moves(cls, pos: Coords) -> List[Coords]:
-        x = pos.x
-        y = pos.y
-        return [
-            Coords(x - 1, y - 2), Coords(x - 2, y - 1),
-            Coords(x + 1, y - 2), Coords(x + 2, y - 1),
-            Coords(x - 1, y + 2), Coords(x - 2, y + 1),
-            Coords(x + 1, y + 2), Coords(x + 2, y + 1),
-        ]
+        return list(KNIGHT_MOVES[pos.y * 8 + pos.x])
 
     @classmethod
     def get_lines(cls, pos: Coords, length: int) -> List[Coords]:
@@ -58,13 +93,8 @@ class DirectionMixin:
         :param length: length of lines starting at `pos`
         :return: list of tiles in straight lines starting from `pos`
         """
-        x = pos.x
-        y = pos.y
-
-        res = list()
-        for _x in range(1, length + 1):
-            res.extend([Coords(x + _x, y), Coords(x - _x, y), Coords(x, y + _x), Coords(x, y - _x)])
-        return list(set(filter(lambda val: val.x >= 0 and val.y >= 0 and abs(val.x) < 8 and abs(val.y) < 8, res)))
+        index = pos.y * 8 + pos.x
+        return [field for direction in LINE_DIRECTIONS for field in RAYS[direction][index][:length]]
 
 
 class BoardState:
@@ -75,7 +105,7 @@ class BoardState:
         """
         Helper to detect figure on given tile
         """
-        return self.board.check_field(move)
+        return self.board.fields[move.row][move.col]
 
     @staticmethod
     def clean_target_fields(fields: List[Coords]) -> List[Coords]:
@@ -96,13 +126,25 @@ class BoardState:
 
 
 class Movable(DirectionMixin, BoardState):
+    # allowed moves already end at the first blocking figure, no need to test tiles in between
+    ray_moves: bool = False
+
     def __init__(self, pos: Coords, board: 'CheckerBoard'):
-        self.position = pos
+        # tile index `y * 8 + x`, `position` is derived from it
+        self.square: int = pos.y * 8 + pos.x
         self.prev_position = None
         self.has_moved = False
         self.can_jump = False
         super().__init__(board)
 
+    @property
+    def position(self) -> Coords:
+        return COORDS[self.square]
+
+    @position.setter
+    def position(self, value: Coords) -> None:
+        self.square = value.y * 8 + value.x
+
     def move(self, new_pos: Coords) -> bool:
         """
         Moves a figure to a new given position, checks and return success
@@ -112,7 +154,7 @@ class Movable(DirectionMixin, BoardState):
         :param new_pos: position to move the figure to, potentially
         :return: successfully moved figure
         """
-        if self.is_move_allowed(new_pos):  # not self.locked() and self.is_move_allowed(new_pos):
+        if self.is_move_allowed(new_pos):
             self.move_in_state(new_pos)
             self.prev_position = self.position
             self.position = new_pos
@@ -130,19 +172,66 @@ class Movable(DirectionMixin, BoardState):
         return fig is None or (
                 fig and (fig.position.x == move.x and fig.position.y == move.y and fig.is_white != self.is_white))
 
+    def get_ray_moves(self, directions) -> List[Coords]:
+        """
+        Walks the precomputed rays of given directions, each ray ends at the first figure in its way.
+
+        :param directions: indices into `DIRECTIONS`
+        :return: reachable tiles, including tiles of blocking figures
+        """
+        fields = self.board.fields
+        moves = list()
+        for direction in directions:
+            for tile in RAY_TILES[direction][self.square]:
+                moves.append(COORDS[tile])
+                if fields[tile >> 3][tile & 7] is not None:
+                    break
+        return moves
+
+    def get_ray_targets(self, directions) -> List[int]:
+        """
+        Tile indices reachable along the rays of given directions, including captures
+
+        :param directions: indices into `DIRECTIONS`
+        """
+        fields = self.board.fields
+        is_white = self.is_white
+        targets = list()
+        for direction in directions:
+            for tile in RAY_TILES[direction][self.square]:
+                cell = fields[tile >> 3][tile & 7]
+                if cell is None:
+                    targets.append(tile)
+                    continue
+                if cell.is_white != is_white:
+                    targets.append(tile)
+                break
+        return targets
+
+    def get_jump_targets(self, table: List[List[int]]) -> List[int]:
+        """
+        Tile indices of a jump table which are empty or hold an enemy figure
+
+        :param table: `KNIGHT_TARGETS` or `KING_TARGETS`
+        """
+        fields = self.board.fields
+        is_white = self.is_white
+        targets = list()
+        for tile in table[self.square]:
+            cell = fields[tile >> 3][tile & 7]
+            if cell is None or cell.is_white != is_white:
+                targets.append(tile)
+        return targets
+
     def remove_set(self, coords):
+        fields = self.board.fields
+        check_between = not self.can_jump and not self.ray_moves
         new_coords = list()
-        found_x = list()
-        found_y = list()
         for field in coords:
-            if not self.can_jump and ((fig := self.get_figures_between(field)) is not None and fig.is_white == self.is_white):
-                found_x.append(field.x)
-                found_y.append(field.y)
+            if check_between and ((fig := self.get_figures_between(field)) is not None and fig.is_white == self.is_white):
                 continue
-            cell = self.check_field(field)
+            cell = fields[field.y][field.x]
             if cell and cell.is_white == self.is_white:
-                found_x.append(field.x)
-                found_y.append(field.y)
                 continue
             new_coords.append(field)
         return new_coords
@@ -159,7 +248,7 @@ class Movable(DirectionMixin, BoardState):
 
         figure_at_pos = self.check_field(move)
 
-        if self.can_jump:
+        if self.can_jump or self.ray_moves:
             return figure_at_pos
 
         figure_between = self.get_figures_between(move)
@@ -199,37 +288,11 @@ class Movable(DirectionMixin, BoardState):
         """
         raise NotImplementedError
 
-    def locked(self, is_white: bool) -> bool:
-        """
-        :param is_white:
-        :return: False if figure would allow checkmate
+    def targets(self) -> List[int]:
         """
-        positions = self.__get_checkmate_positions(is_white)
-        return self.position in positions
+        Pseudo-legal target tile indices used by the move generator,
+        castling is left to the board.
 
-    def __get_checkmate_positions(self, is_white: bool) -> List[Coords]:
+        :return: tiles which are empty or hold an enemy figure
         """
-        TODO: fix me
-        """
-        from src.figures import FieldType
-        own_king_pos: Coords = Coords(-1, -1)
-        for row in self.board.fields:
-            for cell in row:
-                if not cell:
-                    continue
-                if cell.type - FieldType.KING == (FieldType.WHITE if is_white else FieldType.BLACK):
-                    own_king_pos = cell.position
-
-        assert own_king_pos != (-1, -1), 'Did not find King... Something is wrong!'
-
-        checkmate_positions: List[Coords] = list()
-        for row in self.board.fields:
-            for cell in row:
-                if not cell or cell.is_white == is_white:
-                    continue
-                target_fields = cell.allowed_moves
-                if own_king_pos in target_fields:
-                    for x in range(abs(own_king_pos.x - cell.position.x) + 1):
-                        for y in range(abs(own_king_pos.y - cell.position.y) + 1):
-                            checkmate_positions.append(Coords(own_king_pos.x + x, own_king_pos.y + y))
-        return checkmate_positions
+        raise NotImplementedError
@@ -0,0 +1,127 @@
+from typing import Optional
+
+from src.figures import FieldType
+from src.helpers import Coords, COORDS
+
+
+PROMOTION_TYPES = (FieldType.QUEEN, FieldType.ROOK, FieldType.BISHOP, FieldType.KNIGHT)
+PROMOTION_CHARS = {
+    FieldType.QUEEN: 'q',
+    FieldType.ROOK: 'r',
+    FieldType.BISHOP: 'b',
+    FieldType.KNIGHT: 'n',
+}
+
+
+class Move:
+    """
+    A single move of a figure from `start` to `end`.
+
+    Tiles are indices `y * 8 + x`, castling is represented by the king moving two tiles towards the rook,
+    `promotion` holds the `FieldType` value (without color) a pawn gets promoted to.
+    """
+    __slots__ = ('start', 'end', 'promotion')
+
+    def __init__(self, start: int, end: int, promotion: int = FieldType.EMPTY) -> None:
+        self.start = start
+        self.end = end
+        self.promotion = promotion
+
+    @classmethod
+    def from_string(cls, move: str) -> 'Move':
+        """
+        Parses a move in long algebraic notation, e.g. 'e2e4' or 'e7e8q'
+        """
+        promotion = FieldType.EMPTY
+        if len(move) > 4:
+            promotion = {char: field_type for field_type, char in PROMOTION_CHARS.items()}[move[4].lower()]
+        return cls(Coords.from_string(move[:2]).index, Coords.from_string(move[2:4]).index, promotion)
+
+    @classmethod
+    def from_coords(cls, start: Coords, end: Coords, promotion: int = FieldType.EMPTY) -> 'Move':
+        return cls(start.index, end.index, promotion)
+
+    def encode(self) -> int:
+        """
+        Packs the move into 15 bits: start tile, end tile and promotion type
+        """
+        return self.start | (self.end << 6) | (self.promotion << 12)
+
+    @classmethod
+    def decode(cls, value: int) -> 'Move':
+        return cls(value & 63, (value >> 6) & 63, value >> 12)
+
+    def to_string(self) -> str:
+        return COORDS[self.start].to_string() + COORDS[self.end].to_string() + PROMOTION_CHARS.get(self.promotion, '')
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Move) and self.start == other.start and self.end == other.end
+                and self.promotion == other.promotion)
+
+    def __hash__(self) -> int:
+        return self.encode()
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Undo:
+    """
+    Record of everything `CheckerBoard.make_move` changed, consumed by `CheckerBoard.unmake_move`
+    """
+
+    def __init__(self, move: Move, figure: 'Figure', captured: Optional['Figure'], has_moved: bool,
+                 prev_position: Optional[Coords], can_castle: bool, en_passant_figure: Optional['Figure'],
+                 zobrist: int) -> None:
+        self.move = move
+        self.figure = figure
+        self.captured = captured
+        self.has_moved = has_moved
+        self.prev_position = prev_position
+        self.can_castle = can_castle
+        self.en_passant_figure = en_passant_figure
+        self.hash = zobrist
+        # running totals of the board, see `CheckerBoard.material` and `CheckerBoard.evaluate`
+        self.material = 0
+        self.score = 0
+        self.rook: Optional['Figure'] = None
+        self.rook_has_moved = False
+        self.promoted: Optional['Figure'] = None
+
+
+class MoveResult:
+    """
+    Outcome of `Game.play`, truthy if the move was legal and played
+
+    :param move: requested move
+    :param undo: undo record of the played move, None if it was rejected
+    :param is_check: the player to move is in check after the move
+    :param is_game_over: the move ended the game
+    """
+
+    def __init__(self, move: Optional[Move], undo: Optional[Undo] = None, is_check: bool = False,
+                 is_game_over: bool = False) -> None:
+        self.move = move
+        self.undo = undo
+        self.is_check = is_check
+        self.is_game_over = is_game_over
+
+    @property
+    def is_legal(self) -> bool:
+        return self.undo is not None
+
+    @property
+    def captured(self) -> Optional['Figure']:
+        return self.undo.captured if self.undo else None
+
+    def __bool__(self) -> bool:
+        return self.is_legal
+
+    def __str__(self) -> str:
+        if not self.is_legal:
+            return f'illegal move {self.move}'
+        suffix = '#' if self.is_game_over and self.is_check else '+' if self.is_check else ''
+        return f'{self.move}{suffix}'
@@ -0,0 +1,116 @@
+import time
+from typing import Dict, Optional
+
+from src.board import CheckerBoard
+
+
+"""
+Reference positions with published node counts, see https://www.chessprogramming.org/Perft_Results
+"""
+PERFT_POSITIONS = [
+    ('start', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+     [20, 400, 8902, 197281, 4865609]),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     [48, 2039, 97862, 4085603]),
+    ('en-passant', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     [14, 191, 2812, 43238, 674624]),
+    ('promotion', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     [6, 264, 9467, 422333]),
+    ('promotion-check', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     [44, 1486, 62379, 2103487]),
+]
+
+
+def perft(board: CheckerBoard, depth: int, cache: Optional[Dict] = None) -> int:
+    """
+    Counts leaf nodes of the legal move tree
+
+    :param board: board to start from, restored after the run
+    :param depth: depth in plies
+    :param cache: optional dict caching subtree counts by position hash and depth
+    :return: number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+    if cache is not None:
+        key = (board.hash, depth)
+        if key in cache:
+            return cache[key]
+
+    moves = board.legal_moves()
+    if depth == 1:
+        nodes = len(moves)
+    else:
+        nodes = 0
+        for move in moves:
+            undo = board.make_move(move)
+            nodes += perft(board, depth - 1, cache)
+            board.unmake_move(undo)
+
+    if cache is not None:
+        cache[key] = nodes
+    return nodes
+
+
+def divide(board: CheckerBoard, depth: int, cache: Optional[Dict] = None) -> Dict[str, int]:
+    """
+    Node counts per root move, helps finding the move generator bug
+
+    :param board: board to start from
+    :param depth: depth in plies, including the root move
+    :param cache: optional subtree cache
+    :return: node count per root move in long algebraic notation
+    """
+    out = dict()
+    for move in board.legal_moves():
+        undo = board.make_move(move)
+        out[move.to_string()] = perft(board, depth - 1, cache)
+        board.unmake_move(undo)
+    return out
+
+
+def run(board: CheckerBoard, depth: int, expected: Optional[int] = None, show_divide: bool = False,
+        use_cache: bool = False, debug_hash: bool = False) -> bool:
+    """
+    Runs perft on a board and prints the node count and nodes per second
+
+    :param debug_hash: verify the incremental Zobrist hash after every move
+    :return: node count matches `expected`, True if nothing is expected
+    """
+    cache = dict() if use_cache else None
+    board.debug_hash = debug_hash
+    start = time.time()
+    if show_divide:
+        counts = divide(board, depth, cache)
+        for move, nodes in sorted(counts.items()):
+            print(f'{move}: {nodes}')
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, depth, cache)
+    duration = max(time.time() - start, 1e-9)
+
+    passed = expected is None or nodes == expected
+    result = '' if expected is None else (' ok' if passed else f' FAILED, expected {expected}')
+    print(f'depth {depth}: {nodes} nodes in {duration:.2f}s ({int(nodes / duration)} nps){result}')
+    return passed
+
+
+def run_suite(max_depth: int = 3, show_divide: bool = False, use_cache: bool = False,
+              debug_hash: bool = False) -> bool:
+    """
+    Runs all reference positions up to given depth
+
+    :return: all node counts matched the published values
+    """
+    from src.backends.base import NullBackend
+    from src.game import Game
+
+    game = Game(backend=NullBackend)
+    passed = True
+    for name, fen, expected in PERFT_POSITIONS:
+        print(f'{name}: {fen}')
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            game.board.reset(fen)
+            passed &= run(game.board, depth, expected[depth - 1], show_divide and depth == max_depth, use_cache,
+                          debug_hash)
+    return passed
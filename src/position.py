@@ -0,0 +1,495 @@
+from typing import List, Optional, Tuple
+
+from src.figures import FieldType, Figure, FIGURE_CLASSES
+from src.movable import DIRECTIONS, KNIGHT_OFFSETS
+from src.move import PROMOTION_TYPES
+
+
+"""
+Bitboard layout
+
+Squares are numbered row-major like `CheckerBoard.fields`, a8 is bit 0 and h1 is bit 63:
+
+    row 0 (8):   0  1  2  3  4  5  6  7
+    row 1 (7):   8  9 10 11 12 13 14 15
+    ...
+    row 7 (1):  56 57 58 59 60 61 62 63
+
+White pawns move towards row 0, black pawns towards row 7.
+"""
+
+FULL = 0xFFFFFFFFFFFFFFFF
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+ROWS = [0xFF << (8 * row) for row in range(8)]
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+PIECE_TYPES = (FieldType.PAWN, FieldType.KNIGHT, FieldType.BISHOP, FieldType.ROOK, FieldType.QUEEN, FieldType.KING)
+
+FEN_TYPES = {
+    'p': FieldType.PAWN,
+    'n': FieldType.KNIGHT,
+    'b': FieldType.BISHOP,
+    'r': FieldType.ROOK,
+    'q': FieldType.QUEEN,
+    'k': FieldType.KING,
+}
+
+# the first four of `DIRECTIONS` increase the square index
+POSITIVE_DIRECTIONS = (0, 1, 2, 3)
+
+# castling rights which remain after a move touches the given square
+CASTLING_MASK = [0xF] * 64
+CASTLING_MASK[0] &= ~BLACK_QUEENSIDE
+CASTLING_MASK[4] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[7] &= ~BLACK_KINGSIDE
+CASTLING_MASK[56] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[60] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[63] &= ~WHITE_KINGSIDE
+
+Move = Tuple[int, int, int]
+
+
+def square(col: int, row: int) -> int:
+    return row * 8 + col
+
+
+def bit(sq: int) -> int:
+    return 1 << sq
+
+
+def lsb(bb: int) -> int:
+    """
+    Index of the least significant set bit
+    """
+    return (bb & -bb).bit_length() - 1
+
+
+def msb(bb: int) -> int:
+    """
+    Index of the most significant set bit
+    """
+    return bb.bit_length() - 1
+
+
+def iter_bits(bb: int):
+    """
+    Yields the indices of all set bits, lowest first
+    """
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def _build_jump_table(offsets) -> List[int]:
+    table = list()
+    for sq in range(64):
+        col, row = sq % 8, sq // 8
+        mask = 0
+        for dx, dy in offsets:
+            if 0 <= col + dx < 8 and 0 <= row + dy < 8:
+                mask |= bit(square(col + dx, row + dy))
+        table.append(mask)
+    return table
+
+
+def _build_rays() -> List[List[int]]:
+    rays = list()
+    for dx, dy in DIRECTIONS:
+        direction = list()
+        for sq in range(64):
+            col, row = sq % 8 + dx, sq // 8 + dy
+            mask = 0
+            while 0 <= col < 8 and 0 <= row < 8:
+                mask |= bit(square(col, row))
+                col += dx
+                row += dy
+            direction.append(mask)
+        rays.append(direction)
+    return rays
+
+
+KNIGHT_ATTACKS = _build_jump_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_jump_table(DIRECTIONS)
+# indexed by [is_white][square]
+PAWN_ATTACKS = [_build_jump_table(((1, 1), (-1, 1))), _build_jump_table(((1, -1), (-1, -1)))]
+RAYS = _build_rays()
+
+
+def ray_attacks(sq: int, direction: int, occupied: int) -> int:
+    """
+    Attacked squares along a single ray, including the first blocker
+
+    :param sq: origin square
+    :param direction: index into `DIRECTIONS`
+    :param occupied: occupancy mask
+    :return: attack mask
+    """
+    ray = RAYS[direction][sq]
+    blockers = ray & occupied
+    if blockers:
+        blocker = lsb(blockers) if direction in POSITIVE_DIRECTIONS else msb(blockers)
+        ray ^= RAYS[direction][blocker]
+    return ray
+
+
+def line_attacks(sq: int, occupied: int) -> int:
+    return (ray_attacks(sq, 0, occupied) | ray_attacks(sq, 1, occupied)
+            | ray_attacks(sq, 4, occupied) | ray_attacks(sq, 5, occupied))
+
+
+def diagonal_attacks(sq: int, occupied: int) -> int:
+    return (ray_attacks(sq, 2, occupied) | ray_attacks(sq, 3, occupied)
+            | ray_attacks(sq, 6, occupied) | ray_attacks(sq, 7, occupied))
+
+
+def piece_index(piece_type: int, is_white: bool) -> int:
+    """
+    Index of the bitboard holding pieces of given type and color
+    """
+    return piece_type - 1 + (0 if is_white else 6)
+
+
+class Position:
+    """
+    Bitboard representation of a chess position.
+
+    Holds twelve piece bitboards (white pawn..king, black pawn..king),
+    occupancy masks, side to move, castling rights and the en-passant target square.
+    Moves are `(start, end, promotion)` tuples of square indices, `promotion` being a `FieldType` piece type or 0.
+    """
+
+    def __init__(self) -> None:
+        self.pieces: List[int] = [0] * 12
+        self.white: int = 0
+        self.black: int = 0
+        self.occupied: int = 0
+        self.is_white_turn: bool = True
+        self.castling: int = 0
+        self.en_passant: Optional[int] = None
+
+    def copy(self) -> 'Position':
+        position = Position()
+        position.pieces = self.pieces.copy()
+        position.white = self.white
+        position.black = self.black
+        position.occupied = self.occupied
+        position.is_white_turn = self.is_white_turn
+        position.castling = self.castling
+        position.en_passant = self.en_passant
+        return position
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Position) and self.pieces == other.pieces
+                and self.is_white_turn == other.is_white_turn and self.castling == other.castling
+                and self.en_passant == other.en_passant)
+
+    def put(self, sq: int, field_type: int) -> None:
+        """
+        Places a piece of given `FieldType` value onto an empty square
+        """
+        is_white = bool(field_type & FieldType.WHITE)
+        mask = bit(sq)
+        self.pieces[piece_index(FieldType.clear(field_type), is_white)] |= mask
+        if is_white:
+            self.white |= mask
+        else:
+            self.black |= mask
+        self.occupied |= mask
+
+    def piece_at(self, sq: int) -> int:
+        """
+        :param sq: square index
+        :return: `FieldType` value of the piece on the square, `FieldType.EMPTY` if none
+        """
+        mask = bit(sq)
+        if not self.occupied & mask:
+            return FieldType.EMPTY
+        offset = 0 if self.white & mask else 6
+        color = FieldType.WHITE if offset == 0 else FieldType.BLACK
+        for piece_type in PIECE_TYPES:
+            if self.pieces[piece_type - 1 + offset] & mask:
+                return color | piece_type
+        return FieldType.EMPTY
+
+    def king_square(self, is_white: bool) -> int:
+        return lsb(self.pieces[piece_index(FieldType.KING, is_white)])
+
+    @classmethod
+    def from_fen(cls, fen: str) -> 'Position':
+        """
+        Creates a position from a FEN string, missing fields default to
+        white to move, no castling rights and no en-passant square.
+        """
+        parts = fen.split()
+        position = cls()
+        for row, element in enumerate(parts[0].split('/')):
+            col = 0
+            for char in element:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                color = FieldType.WHITE if char.isupper() else FieldType.BLACK
+                position.put(square(col, row), color | FEN_TYPES[char.lower()])
+                col += 1
+        position.is_white_turn = len(parts) < 2 or parts[1] == 'w'
+        if len(parts) > 2:
+            for char, right in zip('KQkq', (WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+                if char in parts[2]:
+                    position.castling |= right
+        if len(parts) > 3 and parts[3] != '-':
+            position.en_passant = square(ord(parts[3][0]) - 97, 8 - int(parts[3][1]))
+        return position
+
+    @classmethod
+    def from_board(cls, board: 'CheckerBoard', is_white_turn: Optional[bool] = None) -> 'Position':
+        """
+        Converts the figures of a `CheckerBoard` into a position.
+
+        Castling rights are taken from `CheckerBoard.castling_rights`,
+        the en-passant square from an opponent's pawn flagged with `en_passant`.
+
+        :param board: board to convert
+        :param is_white_turn: side to move, defaults to the board's player to move
+        """
+        if is_white_turn is None:
+            is_white_turn = board.is_white_turn
+        position = cls()
+        position.is_white_turn = is_white_turn
+        for row in board.fields:
+            for figure in row:
+                if figure is None:
+                    continue
+                sq = figure.square
+                position.put(sq, figure.type)
+                if figure.en_passant and figure.is_white != is_white_turn:
+                    position.en_passant = sq + (8 if figure.is_white else -8)
+
+        position.castling = board.castling_rights()
+        return position
+
+    def to_board(self, board: 'CheckerBoard') -> None:
+        """
+        Replaces the figures of a `CheckerBoard` with the content of this position.
+
+        Figures which lost their castling rights and pawns off their initial row are marked as moved,
+        player to move, en-passant pawn and hash of the board are updated.
+
+        :param board: board to populate
+        """
+        from src.helpers import COORDS
+
+        board.fields = [[None for _ in range(8)] for _ in range(8)]
+        for is_white in (True, False):
+            for piece_type in PIECE_TYPES:
+                for sq in iter_bits(self.pieces[piece_index(piece_type, is_white)]):
+                    figure: Figure = FIGURE_CLASSES[piece_type](COORDS[sq], is_white=is_white, _board=board)
+                    if piece_type == FieldType.PAWN:
+                        figure.has_moved = sq // 8 != (6 if is_white else 1)
+                    elif piece_type in (FieldType.KING, FieldType.ROOK):
+                        figure.has_moved = True
+                    board.fields[sq // 8][sq % 8] = figure
+
+        for king_sq, rook_sq, right in ((60, 63, WHITE_KINGSIDE), (60, 56, WHITE_QUEENSIDE),
+                                        (4, 7, BLACK_KINGSIDE), (4, 0, BLACK_QUEENSIDE)):
+            if not self.castling & right:
+                continue
+            color = FieldType.WHITE if king_sq == 60 else FieldType.BLACK
+            king = board.fields[king_sq // 8][king_sq % 8]
+            rook = board.fields[rook_sq // 8][rook_sq % 8]
+            # rights of an inconsistent FEN without the king or rook on its initial tile are dropped
+            if (king is not None and king.type == color | FieldType.KING
+                    and rook is not None and rook.type == color | FieldType.ROOK):
+                king.has_moved = False
+                rook.has_moved = False
+
+        board.en_passant_figure = None
+        if self.en_passant is not None:
+            pawn_sq = self.en_passant + (8 if self.is_white_turn else -8)
+            pawn = board.fields[pawn_sq // 8][pawn_sq % 8] if 0 <= pawn_sq < 64 else None
+            # only a pawn of the side which just moved can be captured en-passant
+            color = FieldType.BLACK if self.is_white_turn else FieldType.WHITE
+            if pawn is not None and pawn.type == color | FieldType.PAWN:
+                pawn.en_passant = True
+                board.en_passant_figure = pawn
+        board.is_white_turn = self.is_white_turn
+        board.index_figures()
+        board.hash = board.compute_hash()
+
+    def attackers_to(self, sq: int, by_white: bool, occupied: Optional[int] = None) -> int:
+        """
+        Mask of all pieces of the given color attacking a square
+
+        :param sq: target square
+        :param by_white: color of the attackers
+        :param occupied: occupancy override, defaults to the current occupancy
+        """
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces
+        offset = 0 if by_white else 6
+        queens = pieces[FieldType.QUEEN - 1 + offset]
+        return (
+            (PAWN_ATTACKS[not by_white][sq] & pieces[FieldType.PAWN - 1 + offset])
+            | (KNIGHT_ATTACKS[sq] & pieces[FieldType.KNIGHT - 1 + offset])
+            | (KING_ATTACKS[sq] & pieces[FieldType.KING - 1 + offset])
+            | (line_attacks(sq, occupied) & (pieces[FieldType.ROOK - 1 + offset] | queens))
+            | (diagonal_attacks(sq, occupied) & (pieces[FieldType.BISHOP - 1 + offset] | queens))
+        )
+
+    def is_attacked(self, sq: int, by_white: bool) -> bool:
+        return self.attackers_to(sq, by_white) != 0
+
+    def in_check(self, is_white: Optional[bool] = None) -> bool:
+        """
+        :param is_white: color of the king to test, defaults to the side to move
+        """
+        if is_white is None:
+            is_white = self.is_white_turn
+        return self.is_attacked(self.king_square(is_white), not is_white)
+
+    def pseudo_legal_moves(self) -> List[Move]:
+        """
+        Generates all moves of the side to move without testing for checks on the own king,
+        except for castling, which requires the king's path to be safe.
+        """
+        moves: List[Move] = list()
+        is_white = self.is_white_turn
+        offset = 0 if is_white else 6
+        own, enemy = (self.white, self.black) if is_white else (self.black, self.white)
+        empty = ~self.occupied & FULL
+        pieces = self.pieces
+
+        # pawns, generated set-wise
+        pawns = pieces[offset]
+        promotion_row = ROWS[0] if is_white else ROWS[7]
+        if is_white:
+            single = (pawns >> 8) & empty
+            double = ((single & ROWS[5]) >> 8) & empty
+            captures = (((pawns & ~FILE_A) >> 9) & enemy, 9), (((pawns & ~FILE_H) >> 7) & enemy, 7)
+            push = 8
+        else:
+            single = (pawns << 8) & empty & FULL
+            double = ((single & ROWS[2]) << 8) & empty & FULL
+            captures = (((pawns & ~FILE_H) << 9) & enemy & FULL, -9), (((pawns & ~FILE_A) << 7) & enemy & FULL, -7)
+            push = -8
+
+        for targets, delta in ((single, push), (double, 2 * push)) + captures:
+            for end in iter_bits(targets):
+                start = end + delta
+                if bit(end) & promotion_row:
+                    moves.extend((start, end, promotion) for promotion in PROMOTION_TYPES)
+                else:
+                    moves.append((start, end, 0))
+
+        if self.en_passant is not None:
+            for start in iter_bits(PAWN_ATTACKS[not is_white][self.en_passant] & pawns):
+                moves.append((start, self.en_passant, 0))
+
+        # pieces
+        not_own = ~own & FULL
+        occupied = self.occupied
+        for start in iter_bits(pieces[FieldType.KNIGHT - 1 + offset]):
+            moves.extend((start, end, 0) for end in iter_bits(KNIGHT_ATTACKS[start] & not_own))
+        for start in iter_bits(pieces[FieldType.BISHOP - 1 + offset]):
+            moves.extend((start, end, 0) for end in iter_bits(diagonal_attacks(start, occupied) & not_own))
+        for start in iter_bits(pieces[FieldType.ROOK - 1 + offset]):
+            moves.extend((start, end, 0) for end in iter_bits(line_attacks(start, occupied) & not_own))
+        for start in iter_bits(pieces[FieldType.QUEEN - 1 + offset]):
+            attacks = line_attacks(start, occupied) | diagonal_attacks(start, occupied)
+            moves.extend((start, end, 0) for end in iter_bits(attacks & not_own))
+        king = self.king_square(is_white)
+        moves.extend((king, end, 0) for end in iter_bits(KING_ATTACKS[king] & not_own))
+
+        # castling
+        if is_white:
+            rights = self.castling & (WHITE_KINGSIDE | WHITE_QUEENSIDE)
+            kingside, queenside, base = WHITE_KINGSIDE, WHITE_QUEENSIDE, 56
+        else:
+            rights = self.castling & (BLACK_KINGSIDE | BLACK_QUEENSIDE)
+            kingside, queenside, base = BLACK_KINGSIDE, BLACK_QUEENSIDE, 0
+        if rights and not self.is_attacked(base + 4, not is_white):
+            if (rights & kingside and not occupied & (bit(base + 5) | bit(base + 6))
+                    and not self.is_attacked(base + 5, not is_white) and not self.is_attacked(base + 6, not is_white)):
+                moves.append((base + 4, base + 6, 0))
+            if (rights & queenside and not occupied & (bit(base + 1) | bit(base + 2) | bit(base + 3))
+                    and not self.is_attacked(base + 3, not is_white) and not self.is_attacked(base + 2, not is_white)):
+                moves.append((base + 4, base + 2, 0))
+        return moves
+
+    def legal_moves(self) -> List[Move]:
+        """
+        Filters pseudo-legal moves which would leave the own king in check
+        """
+        is_white = self.is_white_turn
+        return [move for move in self.pseudo_legal_moves() if not self.make_move(move).in_check(is_white)]
+
+    def make_move(self, move: Move) -> 'Position':
+        """
+        Applies a move to a copy of the position.
+
+        Bitboards are plain integers, so copying is cheap and no undo information is needed.
+
+        :param move: `(start, end, promotion)` tuple
+        :return: the new position
+        """
+        start, end, promotion = move
+        position = self.copy()
+        pieces = position.pieces
+        is_white = self.is_white_turn
+        offset = 0 if is_white else 6
+        start_mask, end_mask = bit(start), bit(end)
+        move_mask = start_mask | end_mask
+
+        moved_type = FieldType.clear(self.piece_at(start))
+        captured = self.piece_at(end)
+        if captured:
+            pieces[piece_index(FieldType.clear(captured), not is_white)] ^= end_mask
+            if is_white:
+                position.black ^= end_mask
+            else:
+                position.white ^= end_mask
+            position.occupied ^= end_mask
+
+        pieces[moved_type - 1 + offset] ^= move_mask
+        if is_white:
+            position.white ^= move_mask
+        else:
+            position.black ^= move_mask
+        position.occupied ^= move_mask
+
+        if promotion:
+            pieces[offset] ^= end_mask
+            pieces[promotion - 1 + offset] |= end_mask
+
+        position.en_passant = None
+        if moved_type == FieldType.PAWN:
+            if end == self.en_passant:
+                captured_sq = end + (8 if is_white else -8)
+                captured_mask = bit(captured_sq)
+                pieces[piece_index(FieldType.PAWN, not is_white)] ^= captured_mask
+                if is_white:
+                    position.black ^= captured_mask
+                else:
+                    position.white ^= captured_mask
+                position.occupied ^= captured_mask
+            elif abs(end - start) == 16:
+                position.en_passant = (start + end) // 2
+        elif moved_type == FieldType.KING and abs(end - start) == 2:
+            rook_start, rook_end = (start + 3, start + 1) if end > start else (start - 4, start - 1)
+            rook_mask = bit(rook_start) | bit(rook_end)
+            pieces[FieldType.ROOK - 1 + offset] ^= rook_mask
+            if is_white:
+                position.white ^= rook_mask
+            else:
+                position.black ^= rook_mask
+            position.occupied ^= rook_mask
+
+        position.castling &= CASTLING_MASK[start] & CASTLING_MASK[end]
+        position.is_white_turn = not is_white
+        return position
@@ -0,0 +1,175 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by `CheckerBoard.hash`.
+
+    Entries live in preallocated NumPy arrays, so memory stays bounded by the configured size.
+    Every bucket holds two entries, a depth-preferred one which is only replaced by deeper
+    or equally deep results (or results of a newer search) and an always-replace one.
+
+    Moves are stored in their `Move.encode` form, 0 meaning no move.
+
+    A shared table keeps its arrays in `multiprocessing.shared_memory`, pickling it (e.g. passing it to a
+    worker process) attaches to the same memory instead of copying it. Concurrent stores are not locked,
+    a torn entry at worst costs a wrong cutoff or an unusable hash move, as usual for Lazy SMP.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # key, depth, bound, score, move and age per entry
+    ENTRY_BYTES = 8 + 1 + 1 + 4 + 2 + 1
+    BUCKET_SIZE = 2
+
+    def __init__(self, size_mb: float = 16, shared: bool = False, name: Optional[str] = None) -> None:
+        """
+        :param size_mb: memory budget in megabytes
+        :param shared: allocate the entries in shared memory
+        :param name: attach to the shared memory block of another table instead of allocating one
+        """
+        self.size_mb = size_mb
+        self.shared = shared or name is not None
+        self.memory: Optional['SharedMemory'] = None
+        self.owner = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.age = 0
+        self.allocate(size_mb, name)
+
+    def __reduce__(self):
+        if self.memory is None:
+            return super().__reduce__()
+        return TranspositionTable, (self.size_mb, True, self.memory.name), {'age': self.age}
+
+    def allocate(self, size_mb: float, name: Optional[str] = None) -> None:
+        """
+        (Re-)allocates the table, dropping all entries
+
+        :param size_mb: memory budget in megabytes
+        :param name: shared memory block to attach to, its entries are kept
+        """
+        self.close()
+        self.size_mb = size_mb
+        buckets = max(1, int(size_mb * 1024 * 1024) // (self.ENTRY_BYTES * self.BUCKET_SIZE))
+        # round down to a power of two to index by masking the hash
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = buckets - 1
+        shape = (buckets, self.BUCKET_SIZE)
+        # widest types first to keep every array aligned
+        dtypes = (np.uint64, np.int32, np.uint16, np.int8, np.int8, np.uint8)
+        buffer = None
+        if self.shared:
+            from multiprocessing.shared_memory import SharedMemory
+
+            size = sum(np.dtype(dtype).itemsize for dtype in dtypes) * buckets * self.BUCKET_SIZE
+            self.owner = name is None
+            if self.owner:
+                self.memory = SharedMemory(create=True, size=size)
+            else:
+                self.memory = SharedMemory(name=name)
+                # the creating process owns the block, keep the resource tracker from unlinking it
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.memory._name, 'shared_memory')
+            buffer = self.memory.buf
+
+        arrays = list()
+        offset = 0
+        for dtype in dtypes:
+            if buffer is None:
+                arrays.append(np.empty(shape, dtype=dtype))
+            else:
+                arrays.append(np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset))
+                offset += arrays[-1].nbytes
+        self.keys, self.scores, self.moves, self.depths, self.bounds, self.ages = arrays
+        if name is None:
+            self.keys.fill(0)
+            self.depths.fill(-1)
+            self.bounds.fill(0)
+            self.scores.fill(0)
+            self.moves.fill(0)
+            self.ages.fill(0)
+
+    def close(self) -> None:
+        """
+        Releases the shared memory, the creating table also removes the block
+        """
+        if self.memory is None:
+            return
+        # drop the views before closing the buffer they point into
+        self.keys = self.scores = self.moves = self.depths = self.bounds = self.ages = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory = None
+
+    def clear(self) -> None:
+        self.depths.fill(-1)
+        self.keys.fill(0)
+        self.hits = self.misses = self.stores = 0
+
+    def new_search(self) -> None:
+        """
+        Marks entries of previous searches as replaceable
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Looks up a position
+
+        :param key: position hash
+        :return: depth, bound, score and encoded move, or None
+        """
+        index = key & self.mask
+        keys = self.keys[index]
+        for slot in range(self.BUCKET_SIZE):
+            if keys[slot] == key and self.depths[index, slot] >= 0:
+                self.hits += 1
+                return (int(self.depths[index, slot]), int(self.bounds[index, slot]),
+                        int(self.scores[index, slot]), int(self.moves[index, slot]))
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int = 0) -> None:
+        """
+        Stores a search result, the depth-preferred slot takes it if it is at least as deep
+        or holds an entry of an older search, otherwise the always-replace slot does.
+
+        :param key: position hash
+        :param depth: remaining search depth of the result
+        :param bound: one of `EXACT`, `LOWER` or `UPPER`
+        :param score: score of the position
+        :param move: encoded best move, 0 if unknown
+        """
+        index = key & self.mask
+        slot = 1
+        if (self.keys[index, 0] == key or depth >= self.depths[index, 0]
+                or self.ages[index, 0] != self.age):
+            slot = 0
+        if not move and self.keys[index, slot] == key:
+            # keep the known best move of the position
+            move = int(self.moves[index, slot])
+        self.keys[index, slot] = key
+        self.depths[index, slot] = min(depth, 127)
+        self.bounds[index, slot] = bound
+        self.scores[index, slot] = score
+        self.moves[index, slot] = move
+        self.ages[index, slot] = self.age
+        self.stores += 1
+
+    def hashfull(self) -> int:
+        """
+        Permille of used entries, estimated from the first thousand buckets
+        """
+        sample = self.depths[:1000]
+        return int(1000 * np.count_nonzero(sample >= 0) / sample.size)
+
+    def __str__(self) -> str:
+        probes = self.hits + self.misses
+        rate = 100 * self.hits / probes if probes else 0.
+        return f'TT {self.size_mb}MB: {self.hits} hits, {self.misses} misses ({rate:.1f}%), {self.stores} stores'
@@ -0,0 +1,24 @@
+import random
+
+from src.figures import FieldType
+
+
+"""
+Random keys for Zobrist hashing of `CheckerBoard` positions.
+
+A position hash is the xor of the keys of all figures on their tiles (indexed `y * 8 + x`),
+the castling rights, the column of the pawn capturable en-passant and `SIDE_KEY` when black is to move.
+A fixed seed keeps hashes stable across processes.
+"""
+
+_random = random.Random(20210722)
+
+PIECE_KEYS = {
+    color | piece: [_random.getrandbits(64) for _ in range(64)]
+    for color in (FieldType.WHITE, FieldType.BLACK)
+    for piece in (FieldType.PAWN, FieldType.KNIGHT, FieldType.BISHOP, FieldType.ROOK, FieldType.QUEEN, FieldType.KING)
+}
+# indexed by the castling rights bit mask
+CASTLING_KEYS = [0] + [_random.getrandbits(64) for _ in range(15)]
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+SIDE_KEY = _random.getrandbits(64)
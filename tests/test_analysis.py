@@ -0,0 +1,72 @@
+import time
+from unittest import TestCase, main
+
+from src.engine.analysis import Analysis
+from src.game import Game
+
+
+class AnalysisTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = Game(use_pygame=False).board
+        self.analysis = Analysis(hash_size=1, depth=3)
+
+    def tearDown(self) -> None:
+        self.analysis.close()
+
+    def wait(self, timeout: float = 10.):
+        deadline = time.time() + timeout
+        while self.analysis.searching and time.time() < deadline:
+            self.analysis.snapshot()
+            time.sleep(0.01)
+        return self.analysis.snapshot()
+
+    def test_follow(self):
+        self.board.reset('4k3/8/8/3q4/8/8/8/3RK3 w - -')
+        start = self.board.hash
+        self.analysis.follow(self.board)
+        info = self.wait()
+
+        self.assertFalse(self.analysis.searching)
+        self.assertEqual(info.depth, 3)
+        self.assertEqual(info.best_move.to_string(), 'd1d5')
+        self.assertEqual(self.board.hash, start)
+
+        # unchanged position keeps the result, a new one discards it
+        self.analysis.follow(self.board)
+        self.assertIs(self.analysis.snapshot(), info)
+        self.board.reset('4k3/8/8/3r4/8/8/8/3QK3 b - -')
+        self.analysis.follow(self.board)
+        self.assertIsNot(self.analysis.snapshot(), info)
+        self.assertEqual(self.wait().best_move.to_string(), 'd5d1')
+
+    def test_stop(self):
+        self.analysis.depth = 64
+        self.analysis.start(self.board)
+        self.analysis.stop()
+
+        self.assertFalse(self.analysis.searching)
+        self.assertIsNone(self.analysis.process)
+
+    def test_follow_does_not_block(self):
+        self.analysis.depth = 64
+        self.analysis.follow(self.board)
+        first = self.analysis.process
+        self.board.reset('4k3/8/8/3q4/8/8/8/3RK3 w - -')
+        start = time.time()
+        self.analysis.follow(self.board)
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(self.analysis.stopping, [first])
+        deadline = time.time() + 10.
+        while self.analysis.stopping and time.time() < deadline:
+            self.analysis.snapshot()
+            time.sleep(0.01)
+        # the stopped worker is reaped, its results never show up for the new position
+        self.assertEqual(self.analysis.stopping, [])
+        self.analysis.stop(wait=True)
+        info = self.analysis.latest
+        self.assertTrue(info is None or info.best_move.to_string() == 'd1d5')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+from unittest import TestCase, main, mock
+
+from parameterized import parameterized
+
+from src.board import CheckerBoard
+from src.figures import FieldType, Rook
+from src.helpers import Coords
+from src.move import Move
+from src.position import Position
+
+
+def snapshot(board: CheckerBoard):
+    return [
+        [(cell.type, cell.position.x, cell.position.y, cell.has_moved, cell.en_passant) if cell else None for cell in row]
+        for row in board.fields
+    ], board.en_passant_figure
+
+
+class CheckerBoardTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+
+    def test_copy_is_independent(self):
+        board = self.board.copy()
+        board.make_move(Move.from_string('e2e4'))
+
+        self.assertIsNotNone(self.board.check_field(Coords.from_string('e2')))
+        self.assertIsNone(self.board.check_field(Coords.from_string('e4')))
+        self.assertIs(board.check_field(Coords.from_string('e4')).board, board)
+
+    @parameterized.expand([
+        ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR', [], 'e2e4', 'e4', FieldType.WHITE | FieldType.PAWN),
+        ('4k3/8/8/3p4/4Q3/8/8/4K3', [], 'e4d5', 'd5', FieldType.WHITE | FieldType.QUEEN),
+        ('4k3/3p4/8/4P3/8/8/8/4K3', ['e5'], 'd7d5', 'd5', FieldType.BLACK | FieldType.PAWN),
+        ('4k3/8/8/8/8/8/8/R3K2R', [], 'e1g1', 'f1', FieldType.WHITE | FieldType.ROOK),
+        ('4k3/8/8/8/8/8/8/R3K2R', [], 'e1c1', 'd1', FieldType.WHITE | FieldType.ROOK),
+        ('3rk3/2P5/8/8/8/8/8/4K3', ['c7'], 'c7d8n', 'd8', FieldType.WHITE | FieldType.KNIGHT),
+    ])
+    def test_make_unmake_move(self, fen, moved, move, tile, expected):
+        self.board.reset(fen)
+        for position in moved:
+            self.board.check_field(Coords.from_string(position)).has_moved = True
+        before = snapshot(self.board)
+
+        undo = self.board.make_move(Move.from_string(move))
+        self.assertEqual(self.board.check_field(Coords.from_string(tile)).type, expected)
+
+        self.board.unmake_move(undo)
+        self.assertEqual(snapshot(self.board), before)
+
+    def test_en_passant(self):
+        self.board.reset('4k3/3p4/8/4P3/8/8/8/4K3')
+        self.board.make_move(Move.from_string('d7d5'))
+        before = snapshot(self.board)
+
+        undo = self.board.make_move(Move.from_string('e5d6'))
+        self.assertIsNone(self.board.check_field(Coords.from_string('d5')))
+        self.assertIsNone(self.board.en_passant_figure)
+
+        self.board.unmake_move(undo)
+        self.assertEqual(snapshot(self.board), before)
+        self.assertTrue(self.board.check_field(Coords.from_string('d5')).en_passant)
+
+    def test_piece_lists(self):
+        def scanned(board):
+            return sorted((cell.type, cell.square) for row in board.fields for cell in row if cell)
+
+        def listed(board):
+            return sorted((figure.type, figure.square) for figures in board.pieces.values() for figure in figures)
+
+        self.board.reset('r3k3/1P6/8/8/8/8/8/4K2R w K -')
+        self.assertEqual(self.board.king_square(True), 60)
+        self.assertEqual(self.board.king_square(False), 4)
+
+        self.board.make_move(Move.from_string('b7a8q'))
+        self.assertEqual(self.board.get_figures(FieldType.BLACK | FieldType.ROOK), [])
+        self.assertEqual(len(self.board.get_figures(FieldType.WHITE | FieldType.QUEEN)), 1)
+        self.board.make_move(Move.from_string('e8d7'))
+        self.board.make_move(Move.from_string('e1g1'))
+        self.assertEqual(self.board.king_square(True), 62)
+        self.assertEqual(scanned(self.board), listed(self.board))
+
+        self.board.reset('r3k3/1P6/8/8/8/8/8/4K2R w K -')
+        board = self.board.copy()
+        self.assertEqual(scanned(board), listed(board))
+        self.assertIsNot(board.kings[True], self.board.kings[True])
+
+        undo = self.board.make_move(Move.from_string('b7a8n'))
+        self.board.unmake_move(undo)
+        self.assertEqual(scanned(self.board), listed(self.board))
+        self.assertEqual(self.board.get_figures(FieldType.WHITE | FieldType.KNIGHT), [])
+
+    def test_running_totals(self):
+        def walk(board, depth):
+            material, score = board.material(), board.evaluate()
+            board.index_figures()
+            self.assertEqual((board.material(), board.evaluate()), (material, score))
+            if depth == 0:
+                return
+            for move in board.legal_moves():
+                undo = board.make_move(move)
+                walk(board, depth - 1)
+                board.unmake_move(undo)
+            self.assertEqual((board.material(), board.evaluate()), (material, score))
+
+        self.assertEqual(self.board.material(), 0)
+        self.assertEqual(self.board.evaluate(), 0)
+        self.board.reset('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1')
+        walk(self.board, 2)
+
+        self.board.reset('4k3/8/8/3p4/4Q3/8/8/4K3')
+        self.board.make_move(Move.from_string('e4d5'))
+        self.assertEqual(self.board.material(), 9)
+        self.assertLess(self.board.evaluate(), -900)
+
+    @parameterized.expand([
+        (False, True),
+        (True, False),
+    ])
+    def test_promotion_chooser(self, underpromoted_castling, has_moved):
+        choose_promotion = mock.Mock()
+        board = CheckerBoard(None, mock.Mock(use_pygame=False), underpromoted_castling=underpromoted_castling,
+                             choose_promotion=choose_promotion)
+        board.reset('4k3/P7/8/8/8/8/8/4K3 w - -')
+        board.perform_move(Move.from_string('a7a8q'), select_promotion=True)
+        choose_promotion.assert_called_once_with(True)
+
+        board.promote(Rook)
+        choose_promotion.assert_called_with(False)
+        rook = board.check_field(Coords.from_string('a8'))
+        self.assertIsInstance(rook, Rook)
+        self.assertEqual(rook.has_moved, has_moved)
+        self.assertEqual(board.copy().choose_promotion, choose_promotion)
+
+    def test_promotion_without_chooser(self):
+        self.board.reset('4k3/P7/8/8/8/8/8/4K3 w - -')
+        self.board.perform_move(Move.from_string('a7a8q'), select_promotion=True)
+
+        # nothing could pick another figure, the turn is completed with the queen
+        self.assertEqual(self.board.check_field(Coords.from_string('a8')).type, FieldType.WHITE | FieldType.QUEEN)
+        self.assertIsNone(self.board.selected_figure)
+        self.board.game.history.record.assert_called_once()
+
+    def test_snapshot_restore(self):
+        fen = 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1'
+        self.board.reset(fen)
+        expected = snapshot(self.board), self.board.hash, self.board.material(), self.board.evaluate()
+        figures = {id(figure) for figure in self.board.get_pieces(True) + self.board.get_pieces(False)}
+        start = self.board.snapshot()
+
+        for move in ('a7b8q', 'a3b2', 'g1h1', 'b2a1r', 'h1g1', 'e8g8'):
+            self.board.make_move(Move.from_string(move))
+        self.board.restore(start)
+
+        self.assertEqual((snapshot(self.board), self.board.hash, self.board.material(), self.board.evaluate()),
+                         expected)
+        self.assertEqual({id(figure) for figure in self.board.get_pieces(True) + self.board.get_pieces(False)},
+                         figures)
+        self.assertEqual(self.board.hash, self.board.compute_hash())
+        self.assertEqual(len(self.board.legal_moves()), 6)
+
+
+class ZobristTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+        self.board.debug_hash = True
+
+    def test_transposition(self):
+        start = self.board.hash
+        for move in ['g1f3', 'g8f6', 'f3g1', 'f6g8']:
+            self.board.make_move(Move.from_string(move))
+
+        self.assertEqual(self.board.hash, start)
+
+    def test_castling_rights(self):
+        self.board.reset('r3k2r/8/8/8/8/8/8/R3K2R w KQkq -')
+        start = self.board.hash
+        for move in ['h1g1', 'h8g8', 'g1h1', 'g8h8']:
+            self.board.make_move(Move.from_string(move))
+
+        moved = self.board.hash
+        self.board.reset('r3k2r/8/8/8/8/8/8/R3K2R w Qq -')
+
+        self.assertNotEqual(moved, start)
+        self.assertEqual(moved, self.board.hash)
+
+    def test_turn(self):
+        start = self.board.hash
+        self.board.set_turn(False)
+
+        self.assertNotEqual(self.board.hash, start)
+        self.board.verify_hash()
+
+    def test_incremental_updates(self):
+        from src.perft import perft
+
+        self.board.reset('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        start = self.board.hash
+
+        self.assertEqual(perft(self.board, 2), 2039)
+        self.assertEqual(self.board.hash, start)
+
+
+class LegalMovesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+
+    def _legal_moves(self, fen):
+        self.board.reset(fen)
+        return {move.to_string() for move in self.board.legal_moves()}
+
+    def test_pinned_figure(self):
+        moves = self._legal_moves('4r1k1/8/8/8/8/8/4B3/4K3 w - -')
+
+        self.assertFalse(any(move.startswith('e2') for move in moves))
+
+    def test_check_evasion(self):
+        moves = self._legal_moves('4k3/8/8/8/1b6/8/8/1N2K3 w - -')
+
+        self.assertSetEqual(moves, {'e1d1', 'e1e2', 'e1f2', 'e1f1', 'b1d2', 'b1c3'})
+
+    def test_castling_through_check(self):
+        moves = self._legal_moves('4k3/8/8/8/8/8/5r2/R3K2R w KQ -')
+        self.assertNotIn('e1g1', moves)
+        self.assertIn('e1c1', moves)
+
+        moves = self._legal_moves('4k3/8/8/8/8/8/3r4/R3K2R w KQ -')
+        self.assertIn('e1g1', moves)
+        self.assertNotIn('e1c1', moves)
+
+    def test_en_passant_discovered_check(self):
+        moves = self._legal_moves('8/8/8/K2pP2r/8/8/8/7k w - d6')
+
+        self.assertNotIn('e5d6', moves)
+
+    def test_missing_king(self):
+        moves = self._legal_moves('4k3/8/8/8/8/8/4P3/8 w - -')
+
+        self.assertSetEqual(moves, {'e2e3', 'e2e4'})
+        self.assertFalse(self.board.is_check())
+
+    @parameterized.expand([
+        ('4k3/8/8/8/8/8/8/R3K2R w KQ -', 'h1', 'e1g1'),
+        ('4k3/8/8/8/8/8/8/R3K2R w KQ -', 'a1', 'e1c1'),
+        ('4k3/8/8/8/8/8/5R2/4K3 w - -', 'f2', None),
+        ('4k3/8/8/8/8/8/8/R3K2R w K -', 'a1', None),
+    ])
+    def test_find_castling(self, fen, target, expected):
+        self.board.reset(fen)
+        move = self.board.find_move(self.board.get_king(True), Coords.from_string(target))
+
+        self.assertEqual(move.to_string() if move else None, expected)
+
+    def test_load_game_from_string(self):
+        self.board.reset('r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 0 1')
+
+        self.assertTrue(self.board.is_white_turn)
+        self.assertIs(self.board.en_passant_figure, self.board.check_field(Coords.from_string('d5')))
+        self.assertFalse(self.board.check_field(Coords.from_string('h1')).has_moved)
+        self.assertTrue(self.board.check_field(Coords.from_string('a1')).has_moved)
+        self.assertTrue(self.board.check_field(Coords.from_string('h8')).has_moved)
+        self.assertFalse(self.board.check_field(Coords.from_string('e8')).has_moved)
+        self.assertEqual(Position.from_board(self.board), Position.from_fen('r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from unittest import TestCase, main
+
+from src.data_collector import Collector
+from src.figures import Pawn
+from src.helpers import Coords
+
+
+class CollectorTestCase(TestCase):
+    def test_start_position(self):
+        collector = Collector(2)
+        collector.init('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR')
+        moves = collector.collect()
+
+        self.assertEqual(sum(map(len, moves[0].values())), 20)
+        self.assertEqual(sum(map(len, moves[1].values())), 20)
+
+    def test_promotion(self):
+        collector = Collector(3)
+        collector.init('4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        board = collector.game.board
+        fields = [list(row) for row in board.fields]
+        moves = collector.collect()
+
+        self.assertEqual(moves[0][Coords.from_string('a7')], [Coords.from_string('a8')])
+        # the board is restored and the pawn never left the board
+        self.assertEqual(board.fields, fields)
+        self.assertIsInstance(board.check_field(Coords.from_string('a7')), Pawn)
+        board.verify_hash()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import contextlib
+import io
+from unittest import TestCase, main
+
+from parameterized import parameterized
+
+from src.backends.base import NullBackend
+from src.figures import FieldType
+from src.game import Game
+from src.helpers import Coords
+from src.history import GameHistory
+from src.move import Move
+
+
+class GameTestCase(TestCase):
+    def setUp(self) -> None:
+        self.game = Game(use_pygame=False)
+
+    def test_play(self):
+        turns = len(self.game.history.turns)
+        result = self.game.play(Move.from_string('e2e4'))
+
+        self.assertTrue(result)
+        self.assertFalse(self.game.is_white_turn)
+        self.assertIsNone(self.game.board.selected_figure)
+        self.assertEqual(len(self.game.history.turns), turns + 1)
+        self.assertEqual(str(result), 'e2e4')
+
+    @parameterized.expand([
+        ('e2e5',),
+        ('e7e5',),
+        ('e2',),
+        ('x9e4',),
+    ])
+    def test_illegal(self, text):
+        result = self.game.play_uci(text)
+
+        self.assertFalse(result)
+        self.assertTrue(self.game.is_white_turn)
+        self.assertIsNotNone(self.game.board.check_field(Coords.from_string('e2')))
+
+    @parameterized.expand([
+        ('c7d8n', FieldType.EMPTY),
+        ('c7d8', FieldType.KNIGHT),
+        ('c7d8', FieldType.WHITE | FieldType.KNIGHT),
+    ])
+    def test_promotion(self, text, promotion):
+        self.game.board.reset('3rk3/2P5/8/8/8/8/8/4K3')
+        result = self.game.play_uci(text, promotion)
+
+        self.assertTrue(result)
+        self.assertEqual(result.captured.type, FieldType.BLACK | FieldType.ROOK)
+        self.assertEqual(self.game.board.check_field(Coords.from_string('d8')).type, FieldType.WHITE | FieldType.KNIGHT)
+        self.assertFalse(self.game.backend.needs_render_selector)
+
+    def test_promotion_needs_piece(self):
+        self.game.board.reset('3rk3/2P5/8/8/8/8/8/4K3')
+
+        self.assertFalse(self.game.play_uci('c7d8'))
+
+    def test_castling(self):
+        self.game.board.reset('4k3/8/8/8/8/8/8/R3K2R')
+
+        self.assertTrue(self.game.play_uci('e1g1'))
+        self.assertEqual(self.game.board.check_field(Coords.from_string('f1')).type, FieldType.WHITE | FieldType.ROOK)
+
+    def test_checkmate(self):
+        for text in ('f2f3', 'e7e5', 'g2g4'):
+            self.assertTrue(self.game.play_uci(text))
+        result = self.game.play_uci('d8h4')
+
+        self.assertTrue(result.is_check and result.is_game_over)
+        self.assertEqual(str(result), 'd8h4#')
+        self.assertFalse(self.game.play_uci('a2a3'))
+
+    def test_restart(self):
+        board = self.game.board
+        for text in ('f2f3', 'e7e5', 'g2g4', 'd8h4'):
+            self.game.play_uci(text)
+        self.game.restart()
+
+        self.assertIs(self.game.board, board)
+        self.assertTrue(self.game.running)
+        self.assertEqual(self.game.history.turns, [])
+        self.assertEqual(self.game.board.hash, self.game.board.compute_hash())
+        self.assertEqual(len(self.game.board.legal_moves()), 20)
+        self.assertTrue(self.game.play_uci('e2e4'))
+
+    def test_null_backend(self):
+        game = Game(backend=NullBackend)
+        game.backend.render()
+        game.backend.handle_game_events([], [])
+
+        self.assertFalse(game.use_pygame)
+        self.assertIsNone(game.backend.canvas)
+        self.assertTrue(game.play_uci('e2e4'))
+
+    def test_silent_game_over(self):
+        game = Game(backend=NullBackend)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for text in ('f2f3', 'e7e5', 'g2g4', 'd8h4'):
+                result = game.play_uci(text)
+
+        self.assertTrue(result.is_game_over)
+        self.assertEqual(output.getvalue(), '')
+
+    def test_isolated_games(self):
+        other = Game(use_pygame=False)
+        self.game.play_uci('e2e4')
+        self.game.running = False
+
+        self.assertTrue(other.running)
+        self.assertEqual(other.history.turns, [])
+        self.assertIsNot(other.game_history, self.game.game_history)
+        # statistics are only read once needed
+        self.assertIsNone(other.game_history._data)
+
+    def test_shared_game_history(self):
+        game_history = GameHistory('missing.json')
+        games = [Game(use_pygame=False, game_history=game_history) for _ in range(2)]
+        for game in games:
+            for text in ('f2f3', 'e7e5', 'g2g4', 'd8h4'):
+                game.play_uci(text)
+
+        self.assertEqual(game_history.data['Black'], 2)
+
+    def test_copy(self):
+        self.game.play_uci('e2e4')
+        game = self.game.copy()
+        game.play_uci('e7e5')
+
+        self.assertEqual(len(self.game.history.turns), 1)
+        self.assertEqual(len(game.history.turns), 2)
+        self.assertFalse(self.game.is_white_turn)
+
+
+if __name__ == '__main__':
+    main()
@@ -50,3 +50,17 @@ class CoordsTestCase(TestCase):
         a = Coords(1, 1)
         b = Coords(2, 2)
         self.assertTrue(a < b)
+
+    @parameterized.expand([
+        ('a8', 0),
+        ('h8', 7),
+        ('e1', 60),
+        ('h1', 63),
+    ])
+    def test_index(self, val, expected):
+        pos = Coords.from_string(val)
+        self.assertEqual(pos.index, expected)
+        self.assertEqual(Coords.from_index(expected), pos)
+
+    def test__hash__(self):
+        self.assertEqual(len({Coords(1, 2), Coords(1, 2), Coords(2, 1)}), 2)
@@ -0,0 +1,44 @@
+from unittest import TestCase, main, mock
+
+from src.board import CheckerBoard
+from src.engine.ordering import MoveOrdering
+from src.move import Move
+
+
+class MoveOrderingTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+        self.board.reset('4k3/8/2r1q3/3P4/8/8/8/3Q3K w - -')
+        self.ordering = MoveOrdering(8)
+
+    def _order(self, hash_move: int = 0):
+        moves = self.board.legal_moves()
+        return [move.to_string() for move in self.ordering.order(self.board, moves, 1, hash_move)]
+
+    def test_mvv_lva(self):
+        moves = self._order()
+
+        # pawn takes queen before pawn takes rook before any quiet move
+        self.assertEqual(moves[:2], ['d5e6', 'd5c6'])
+
+    def test_hash_move(self):
+        moves = self._order(Move.from_string('d1d4').encode())
+
+        self.assertEqual(moves[0], 'd1d4')
+
+    def test_killers_and_history(self):
+        self.ordering.update(Move.from_string('d1a4'), 2, 1)
+        self.ordering.update(Move.from_string('d1b3'), 2, 1)
+        self.ordering.update(Move.from_string('h1g1'), 3, 2)
+
+        moves = self._order()
+        self.assertEqual(moves[2:4], ['d1b3', 'd1a4'])
+        # killers of other plies only count through the history table
+        self.assertEqual(moves[4], 'h1g1')
+
+        self.ordering.age()
+        self.assertEqual(self.ordering.history[Move.from_string('h1g1').start * 64 + Move.from_string('h1g1').end], 4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+from unittest import TestCase, main, mock
+
+from parameterized import parameterized
+
+from src.board import CheckerBoard
+from src.perft import PERFT_POSITIONS, perft, divide
+
+
+class PerftTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+
+    @parameterized.expand([(name, fen, expected[:2]) for name, fen, expected in PERFT_POSITIONS])
+    def test_reference_positions(self, _, fen, expected):
+        self.board.reset(fen)
+        for depth, nodes in enumerate(expected, 1):
+            self.assertEqual(perft(self.board, depth), nodes)
+
+    def test_divide(self):
+        self.board.reset(PERFT_POSITIONS[0][1])
+        counts = divide(self.board, 2)
+
+        self.assertEqual(len(counts), 20)
+        self.assertEqual(counts['e2e4'], 20)
+        self.assertEqual(sum(counts.values()), 400)
+
+    def test_cache(self):
+        name, fen, expected = PERFT_POSITIONS[2]
+        self.board.reset(fen)
+        cache = dict()
+
+        self.assertEqual(perft(self.board, 4, cache), expected[3])
+        self.assertEqual(perft(self.board, 4, cache), expected[3])
+        self.assertTrue(cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+from unittest import TestCase, main, mock
+
+from parameterized import parameterized
+
+from src.board import CheckerBoard
+from src.figures import FieldType
+from src.helpers import Coords
+from src.position import Position, square, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -'
+
+
+def perft(position: Position, depth: int) -> int:
+    if depth == 0:
+        return 1
+    return sum(perft(position.make_move(move), depth - 1) for move in position.legal_moves())
+
+
+class PositionTestCase(TestCase):
+    def test_from_fen(self):
+        position = Position.from_fen(START_FEN)
+
+        self.assertEqual(position.piece_at(square(4, 7)), FieldType.WHITE | FieldType.KING)
+        self.assertEqual(position.piece_at(square(3, 0)), FieldType.BLACK | FieldType.QUEEN)
+        self.assertEqual(position.piece_at(square(4, 4)), FieldType.EMPTY)
+        self.assertEqual(bin(position.occupied).count('1'), 32)
+        self.assertEqual(position.castling, WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE)
+        self.assertTrue(position.is_white_turn)
+
+    def test_attacks(self):
+        position = Position.from_fen('4k3/8/8/8/8/8/8/R3K3 b Q -')
+
+        self.assertTrue(position.is_attacked(square(0, 0), True))
+        self.assertTrue(position.is_attacked(square(3, 7), True))
+        self.assertFalse(position.is_attacked(square(5, 5), True))
+        self.assertFalse(position.in_check())
+
+    @parameterized.expand([
+        (START_FEN, 3, 8902),
+        ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -', 2, 2039),
+        ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -', 3, 2812),
+        ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq -', 2, 264),
+    ])
+    def test_perft(self, fen, depth, expected):
+        self.assertEqual(perft(Position.from_fen(fen), depth), expected)
+
+    def test_board_round_trip(self):
+        board = CheckerBoard(None, mock.Mock(use_pygame=False))
+        board.reset('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR')
+        board.fields[7][7].has_moved = True
+        board.fields[4][4].en_passant = True
+
+        position = Position.from_board(board, is_white_turn=False)
+
+        self.assertEqual(position.castling, WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE)
+        self.assertEqual(position.en_passant, square(4, 5))
+
+        board.fields = [[None for _ in range(8)] for _ in range(8)]
+        position.to_board(board)
+
+        self.assertEqual(Position.from_board(board, is_white_turn=False), position)
+        self.assertEqual(board.check_field(Coords.from_string('a1')).type, FieldType.WHITE | FieldType.ROOK)
+        self.assertTrue(board.check_field(Coords.from_string('h1')).has_moved)
+        self.assertFalse(board.check_field(Coords.from_string('e8')).has_moved)
+
+
+    @parameterized.expand([
+        ('4k3/8/8/8/8/8/8/4K3 w K -', 0, None),
+        ('4k3/8/8/8/8/8/8/4KR1R w KQ -', WHITE_KINGSIDE, None),
+        ('4k3/8/8/8/8/8/8/4K3 w - e6', 0, None),
+        ('4k3/8/8/8/4p3/8/8/4K3 b - e3', 0, None),
+        ('4k3/8/8/3pP3/8/8/8/4K3 w - d6', 0, 'd5'),
+    ])
+    def test_inconsistent_fen_to_board(self, fen, rights, en_passant):
+        board = CheckerBoard(None, mock.Mock(use_pygame=False))
+        Position.from_fen(fen).to_board(board)
+
+        self.assertEqual(board.castling_rights(), rights)
+        self.assertEqual(board.en_passant_figure.position.to_string() if board.en_passant_figure else None,
+                         en_passant)
+        self.assertEqual(board.hash, board.compute_hash())
+
+
+if __name__ == '__main__':
+    main()
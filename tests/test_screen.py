@@ -0,0 +1,125 @@
+import os
+from unittest import TestCase, main, mock
+
+# no window is ever shown, not even once the screen draws
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.backends.screen import Screen, FIGURE_FONT_PATH
+from src.figures import FieldType
+from src.game import Game
+from src.helpers import Coords
+from src.move import Move
+
+
+class ScreenTestCase(TestCase):
+    def test_lazy_window(self):
+        screen = Screen(320, 240)
+
+        self.assertIsNone(screen._window)
+        self.assertEqual((screen.get_width(), screen.get_field_height()), (320, 240 * 0.8))
+        screen.fill((255, 255, 255))
+        self.assertIsNotNone(screen._window)
+        self.assertEqual(screen.get_size(), (320, 240))
+
+    def test_figure_fonts(self):
+        screen = Screen(320, 240)
+        surface = pygame.Surface((40, 40))
+        screen.draw_figure(FieldType.WHITE | FieldType.PAWN, (0, 0), surface)
+        font = screen.figure_font
+
+        self.assertTrue(os.path.isfile(FIGURE_FONT_PATH))
+        self.assertIsNone(screen._window)
+        screen.resize_figure_font(20)
+        self.assertIsNot(screen.figure_font, font)
+        screen.resize_figure_font(14)
+        self.assertIs(screen.figure_font, font)
+
+    def test_glyphs(self):
+        screen = Screen(320, 240)
+        surface = pygame.Surface((40, 40))
+        screen.draw_figure(FieldType.BLACK | FieldType.KING, (0, 0), surface)
+        glyphs = screen.glyphs
+
+        self.assertEqual(len(glyphs), 12)
+        screen.draw_figure(FieldType.WHITE | FieldType.QUEEN, (0, 0), surface)
+        screen.resize_figure_font(screen.figure_size)
+        self.assertIs(screen.glyphs, glyphs)
+        screen.resize_figure_font(30)
+        self.assertEqual(screen.glyphs, dict())
+        screen.draw_figure(FieldType.WHITE | FieldType.QUEEN, (0, 0), surface)
+        self.assertGreater(screen.glyphs[FieldType.WHITE | FieldType.QUEEN].get_height(),
+                           glyphs[FieldType.WHITE | FieldType.QUEEN].get_height())
+
+
+class PygameBackendTestCase(TestCase):
+    def setUp(self) -> None:
+        self.game = Game()
+        self.backend = self.game.backend
+
+    def render(self):
+        with mock.patch('pygame.display.update') as update, mock.patch('pygame.display.flip') as flip:
+            self.backend.render()
+        return flip.called, [tuple(rect) for call in update.call_args_list for rect in call.args[0]]
+
+    def test_dirty_rects(self):
+        self.assertEqual(self.render(), (True, []))
+        # nothing changed, the frame is skipped
+        self.assertEqual(self.render(), (False, []))
+
+        self.game.handle_mouse_click(4, 6)
+        flipped, rects = self.render()
+        width, height = self.game.board.cell_size
+        # e3 and e4 get highlighted
+        self.assertEqual(len(rects), 2)
+        self.assertEqual(rects[0][:2], (int(4 * width), int(4 * height)))
+
+        self.game.handle_mouse_click(4, 4)
+        flipped, rects = self.render()
+        # e2, e3 and e4, the status line and the turn history
+        self.assertFalse(flipped)
+        self.assertEqual(len(rects), 5)
+        self.assertEqual(self.render(), (False, []))
+
+    def test_resize(self):
+        self.render()
+        self.backend.handle_window_resize()
+
+        self.assertTrue(self.render()[0])
+
+    def test_move_hints_cached(self):
+        board = self.game.board
+        self.render()
+        self.game.handle_mouse_click(4, 6)
+        figure = board.selected_figure
+        self.render()
+        overlay = board.hint_overlay
+
+        with mock.patch.object(board, 'legal_moves', wraps=board.legal_moves) as legal_moves:
+            for _ in range(3):
+                board.invalidate()
+                self.render()
+            # held selected, no moves are generated
+            self.assertFalse(legal_moves.called)
+        self.assertIs(board.hint_overlay, overlay)
+
+        board.perform_move(Move.from_string('a2a3'))
+        board.perform_move(Move.from_string('a7a6'))
+        with mock.patch.object(board, 'legal_moves', wraps=board.legal_moves) as legal_moves:
+            figure.move_hints()
+            # the position changed
+            self.assertTrue(legal_moves.called)
+
+    def test_move_hints_legal(self):
+        board = self.game.board
+        board.reset('4r1k1/8/8/8/8/8/4B3/4K3 w - -')
+
+        # the pinned bishop has no legal move
+        self.assertEqual(board.check_field(Coords.from_string('e2')).move_hints(), frozenset())
+        self.assertEqual(board.get_king(True).move_hints(),
+                         {Coords.from_string(tile).index for tile in ('d1', 'f1', 'd2', 'f2')})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+from unittest import TestCase, main, mock
+
+from parameterized import parameterized
+
+from src.board import CheckerBoard
+from src.engine import ParallelSearch, Searcher, SearchLimits, MATE
+from src.transposition import TranspositionTable
+
+
+class SearcherTestCase(TestCase):
+    def setUp(self) -> None:
+        self.board = CheckerBoard(None, mock.Mock(use_pygame=False))
+
+    @parameterized.expand([
+        ('mate in one', '6k1/5ppp/8/8/8/8/8/R5K1 w - -', 'a1a8'),
+        ('hanging queen', '4k3/8/8/3q4/8/8/8/3RK3 w - -', 'd1d5'),
+        ('promotion', '8/5P1k/8/8/8/8/8/K7 w - -', 'f7f8q'),
+    ])
+    def test_best_move(self, _, fen, expected):
+        self.board.reset(fen)
+        result = Searcher(self.board, TranspositionTable(1)).search(SearchLimits(depth=3))
+
+        self.assertEqual(result.best_move.to_string(), expected)
+
+    def test_mate_score(self):
+        self.board.reset('6k1/5ppp/8/8/8/8/8/R5K1 w - -')
+        result = Searcher(self.board).search(SearchLimits(depth=4))
+
+        self.assertEqual(result.score, MATE - 1)
+        self.assertEqual(result.mate_in, 1)
+        self.assertEqual(result.depth, 2)
+
+    def test_iterations(self):
+        infos = list()
+        start = self.board.hash
+        result = Searcher(self.board, on_iteration=infos.append).search(SearchLimits(depth=3))
+
+        self.assertEqual([info.depth for info in infos], [1, 2, 3])
+        self.assertIs(result, infos[-1])
+        self.assertEqual(len(result.pv), 3)
+        self.assertIn('pv ' + result.pv[0].to_string(), str(result))
+        self.assertEqual(self.board.hash, start)
+
+    def test_node_limit(self):
+        start = self.board.hash
+        result = Searcher(self.board).search(SearchLimits(nodes=3000))
+
+        self.assertIsNotNone(result.best_move)
+        self.assertLessEqual(result.nodes, 3000)
+        self.assertEqual(self.board.hash, start)
+        self.assertEqual(len(self.board.legal_moves()), 20)
+
+    def test_statistics(self):
+        self.board.reset('4k3/pp3ppp/2n5/3p4/3P4/2N5/PP3PPP/4K3 w - -')
+        infos = list()
+        Searcher(self.board, statistics=True, on_iteration=infos.append).search(SearchLimits(depth=3))
+        ordered = infos[-1].statistics
+
+        infos = list()
+        Searcher(self.board, statistics=True, ordering=False, on_iteration=infos.append).search(SearchLimits(depth=3))
+        unordered = infos[-1].statistics
+
+        self.assertGreater(ordered.branching_factor, 0)
+        self.assertGreater(ordered.quiescence_nodes, 0)
+        self.assertIn('ebf', str(infos[-1]))
+        self.assertLess(ordered.nodes, unordered.nodes)
+
+    def test_no_moves(self):
+        self.board.reset('7k/5Q2/6K1/8/8/8/8/8 b - -')
+        result = Searcher(self.board).search(SearchLimits(depth=3))
+
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.score, 0)
+
+    def test_parallel(self):
+        self.board.reset('4k3/8/8/3q4/8/8/8/3RK3 w - -')
+        start = self.board.hash
+        search = ParallelSearch(self.board, workers=2, hash_size=1)
+        try:
+            result = search.search(SearchLimits(depth=3))
+        finally:
+            search.close()
+
+        self.assertEqual(result.depth, 3)
+        self.assertEqual(result.best_move.to_string(), 'd1d5')
+        self.assertEqual(self.board.hash, start)
+
+
+if __name__ == '__main__':
+    main()
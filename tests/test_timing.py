@@ -0,0 +1,76 @@
+import time
+from unittest import TestCase, main
+
+from parameterized import parameterized
+
+from src.engine.player import EnginePlayer
+from src.engine.timing import TimeControl
+from src.game import Game
+
+
+class TimeControlTestCase(TestCase):
+    @parameterized.expand([
+        (TimeControl(move_time=2.), 2.),
+        (TimeControl(remaining=60., increment=1.), 60. / 30 + .75),
+        (TimeControl(remaining=60., moves_to_go=10), 6.),
+        (TimeControl(remaining=.02), TimeControl.MIN_BUDGET),
+        (TimeControl(), None),
+    ])
+    def test_budget(self, time_control, expected):
+        self.assertEqual(time_control.budget(), expected)
+
+    def test_spend(self):
+        time_control = TimeControl(remaining=10., increment=1., moves_to_go=5)
+        time_control.spend(3.)
+
+        self.assertEqual((time_control.remaining, time_control.moves_to_go), (8., 4))
+
+
+class EnginePlayerTestCase(TestCase):
+    def setUp(self) -> None:
+        self.game = Game(use_pygame=False, hash_size=1)
+
+    def test_deadline(self):
+        self.game.board.reset('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+        engine = EnginePlayer(is_white=True, time_control=TimeControl(move_time=.2))
+        start = time.time()
+        move = engine.think(self.game)
+
+        self.assertLess(time.time() - start, .4)
+        self.assertIn(move, self.game.board.legal_moves())
+
+    def test_play(self):
+        engine = EnginePlayer(is_white=False, depth=2)
+
+        turns = len(self.game.history.turns)
+
+        self.assertFalse(engine.play(self.game))
+        self.game.board.perform_move(self.game.board.legal_moves()[0])
+        self.assertTrue(engine.play(self.game))
+        self.assertTrue(self.game.is_white_turn)
+        self.assertEqual(len(self.game.history.turns), turns + 2)
+
+    def test_ponder(self):
+        self.game.board.reset('4k3/8/8/3q4/8/8/8/3RK3 b - -')
+        engine = EnginePlayer(is_white=False, time_control=TimeControl(move_time=.5), depth=3, ponder=True)
+        try:
+            # the queen escapes, the expected reply is pondered until the opponent moved
+            self.assertTrue(engine.play(self.game))
+            expected = engine.last_info.pv[1]
+            self.assertIsNotNone(engine.ponder_search.key)
+            time.sleep(.5)
+
+            self.game.board.perform_move(expected)
+            engine.play(self.game)
+            self.assertEqual((engine.ponder_hits, engine.ponder_misses), (1, 0))
+
+            other = next(move for move in self.game.board.legal_moves() if move != engine.last_info.pv[1])
+            self.game.board.perform_move(other)
+            engine.play(self.game)
+            self.assertEqual((engine.ponder_hits, engine.ponder_misses), (1, 1))
+        finally:
+            engine.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+from unittest import TestCase, main
+
+from src.move import Move
+from src.transposition import TranspositionTable
+
+
+class TranspositionTableTestCase(TestCase):
+    def setUp(self) -> None:
+        self.table = TranspositionTable(0.01)
+
+    def test_size(self):
+        self.assertLessEqual(self.table.keys.size * TranspositionTable.ENTRY_BYTES, 0.01 * 1024 * 1024)
+        self.assertEqual(self.table.keys.shape[0], self.table.mask + 1)
+
+    def test_store_probe(self):
+        move = Move.from_string('e7e8q')
+        self.table.store(12345, 4, TranspositionTable.LOWER, -35, move.encode())
+
+        depth, bound, score, encoded = self.table.probe(12345)
+
+        self.assertEqual((depth, bound, score), (4, TranspositionTable.LOWER, -35))
+        self.assertEqual(Move.decode(encoded), move)
+        self.assertIsNone(self.table.probe(12345 + self.table.mask + 1))
+        self.assertEqual((self.table.hits, self.table.misses), (1, 1))
+
+    def test_replacement(self):
+        size = self.table.mask + 1
+        deep, shallow, other = 7, 7 + size, 7 + 2 * size
+        self.table.store(deep, 8, TranspositionTable.EXACT, 1)
+        self.table.store(shallow, 2, TranspositionTable.EXACT, 2)
+        self.table.store(other, 3, TranspositionTable.EXACT, 3)
+
+        # deep entry is preferred, the always-replace slot took the latest
+        self.assertIsNotNone(self.table.probe(deep))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertIsNotNone(self.table.probe(other))
+
+        self.table.new_search()
+        self.table.store(shallow, 1, TranspositionTable.EXACT, 2)
+        self.assertIsNone(self.table.probe(deep))
+        self.assertIsNotNone(self.table.probe(shallow))
+
+    def test_clear(self):
+        self.table.store(1, 1, TranspositionTable.EXACT, 1)
+        self.table.clear()
+
+        self.assertIsNone(self.table.probe(1))
+        self.assertEqual(self.table.hashfull(), 0)
+
+    def test_shared(self):
+        import pickle
+
+        table = TranspositionTable(0.01, shared=True)
+        table.new_search()
+        attached = pickle.loads(pickle.dumps(table))
+        try:
+            attached.store(42, 3, TranspositionTable.EXACT, 17)
+
+            self.assertEqual(table.probe(42)[2], 17)
+            self.assertEqual(attached.age, table.age)
+            self.assertFalse(attached.owner)
+        finally:
+            attached.close()
+            table.close()
+
+
+if __name__ == '__main__':
+    main()
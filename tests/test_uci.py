@@ -0,0 +1,122 @@
+import io
+from unittest import TestCase, main
+
+from parameterized import parameterized
+
+from src.engine.uci import UciEngine
+from src.game import Game
+from src.position import Position
+
+
+class UciEngineTestCase(TestCase):
+    def run_commands(self, *commands: str) -> list:
+        output = io.StringIO()
+        self.engine = UciEngine(Game(use_pygame=False, hash_size=1), io.StringIO('\n'.join(commands) + '\n'), output)
+        self.engine.run()
+        return output.getvalue().splitlines()
+
+    def test_handshake(self):
+        lines = self.run_commands('uci', 'isready', 'quit')
+
+        self.assertEqual(lines[0], 'id name chess')
+        self.assertEqual(lines[-2:], ['uciok', 'readyok'])
+
+    def test_position(self):
+        self.run_commands('setoption name Hash value 2',
+                          'position startpos moves e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 e1g1')
+        board = self.engine.board
+
+        self.assertTrue(board.is_white_turn is False)
+        self.assertEqual(board.king_square(True), 62)
+        self.assertEqual(self.engine.game.hash_size, 2)
+
+    @parameterized.expand([
+        ('e2e5',),
+        ('e2e4 e7e5 e1e3',),
+    ])
+    def test_illegal_move(self, moves):
+        lines = self.run_commands('position startpos moves e2e4', f'position startpos moves {moves}')
+
+        self.assertEqual(lines, [f'info string illegal move {moves.split()[-1]}'])
+        # the position of the previous command is kept
+        board = self.engine.board
+        self.assertFalse(board.is_white_turn)
+        self.assertEqual(board.hash, board.compute_hash())
+        self.assertEqual(Position.from_board(board), Position.from_fen(
+            'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3'))
+
+    @parameterized.expand([
+        ('xyz',),
+        ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w',),
+        ('rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w',),
+        ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x',),
+        ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq z3',),
+    ])
+    def test_invalid_fen(self, fen):
+        lines = self.run_commands('position startpos moves e2e4', f'position fen {fen}')
+
+        self.assertEqual(lines, [f'info string invalid fen {fen}'])
+        self.assertFalse(self.engine.board.is_white_turn)
+
+    @parameterized.expand([
+        ('e2e4 zz',),
+        ('e2e4 e7e5x',),
+        ('e2e4 e9',),
+    ])
+    def test_malformed_move(self, moves):
+        lines = self.run_commands('position startpos moves e2e4', f'position startpos moves {moves}', 'isready')
+
+        self.assertEqual(lines, [f'info string malformed move {moves.split()[1]}', 'readyok'])
+        # the position of the malformed command is ignored
+        self.assertFalse(self.engine.board.is_white_turn)
+
+    def test_invalid_hash(self):
+        lines = self.run_commands('setoption name Hash value x', 'isready')
+
+        self.assertEqual(lines, ['info string invalid Hash value x', 'readyok'])
+        self.assertEqual(self.engine.game.hash_size, 1)
+
+    def test_invalid_go_value(self):
+        lines = self.run_commands('position startpos', 'go depth 1 wtime abc')
+
+        self.assertEqual(lines[0], 'info string invalid go value wtime abc')
+        self.assertTrue(lines[-1].startswith('bestmove '))
+
+    @parameterized.expand([
+        ('stop',),
+        ('ponderhit',),
+    ])
+    def test_infinite_mate(self, command):
+        output = io.StringIO()
+        self.engine = UciEngine(Game(use_pygame=False, hash_size=1), io.StringIO(), output)
+        self.engine.handle('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        self.engine.handle('go infinite' if command == 'stop' else 'go ponder')
+        # the mate is found immediately, yet the best move is held back
+        self.engine.thread.join(0.5)
+        self.assertNotIn('bestmove', output.getvalue())
+
+        self.engine.handle(command)
+        self.engine.wait()
+        self.assertEqual(output.getvalue().splitlines()[-1].split()[:2], ['bestmove', 'a1a8'])
+
+    @parameterized.expand([
+        ('go depth 3', 'd1d5'),
+        ('go movetime 200', 'd1d5'),
+        ('go wtime 10000 btime 10000 winc 100 binc 100', 'd1d5'),
+        ('go nodes 500', 'd1d5'),
+    ])
+    def test_go(self, command, expected):
+        lines = self.run_commands('position fen 4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1', command)
+
+        self.assertTrue(lines[0].startswith('info depth 1 '))
+        self.assertEqual(lines[-1].split()[:2], ['bestmove', expected])
+
+    def test_stop(self):
+        lines = self.run_commands('position startpos', 'go infinite', 'stop', 'isready')
+
+        self.assertTrue(lines[-2].startswith('bestmove '))
+        self.assertEqual(lines[-1], 'readyok')
+
+
+if __name__ == '__main__':
+    main()